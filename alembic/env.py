@@ -8,7 +8,7 @@ from alembic import context  # type: ignore
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from app.database import Base
-from app.models import comment, task, user
+from app.models import comment, job, task, task_inbox, task_stats, user
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
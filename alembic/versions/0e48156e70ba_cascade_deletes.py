@@ -0,0 +1,89 @@
+"""cascade deletes
+
+Revision ID: 0e48156e70ba
+Revises: e1cf07034645
+Create Date: 2026-10-16 14:05:37.512804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "0e48156e70ba"
+down_revision: Union[str, Sequence[str], None] = "e1cf07034645"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, column, referent) for the default-named constraints created
+# by the initial revision
+FOREIGN_KEYS = [
+    ("tasks_creator_id_fkey", "tasks", "creator_id", "users"),
+    ("comments_task_id_fkey", "comments", "task_id", "tasks"),
+    ("comments_author_id_fkey", "comments", "author_id", "users"),
+    ("task_assignments_task_id_fkey", "task_assignments", "task_id", "tasks"),
+    (
+        "task_assignments_assigned_user_id_fkey",
+        "task_assignments",
+        "assigned_user_id",
+        "users",
+    ),
+    (
+        "task_assignments_assigned_by_id_fkey",
+        "task_assignments",
+        "assigned_by_id",
+        "users",
+    ),
+]
+
+# Referencing columns the cascades have to probe that no index led with yet
+# (name, table, columns)
+INDEXES = [
+    ("ix_comments_author_id", "comments", ["author_id"]),
+    ("ix_task_assignments_assigned_by_id", "task_assignments", ["assigned_by_id"]),
+]
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    # NOT VALID keeps the swap to a brief lock; validation afterwards only
+    # takes SHARE UPDATE EXCLUSIVE and lets writes continue
+    for name, table, column, referent in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name,
+            table,
+            referent,
+            [column],
+            ["id"],
+            ondelete=ondelete,
+            postgresql_not_valid=True,
+        )
+    for name, table, _, _ in FOREIGN_KEYS:
+        op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    _replace_foreign_keys("CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_foreign_keys(None)
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
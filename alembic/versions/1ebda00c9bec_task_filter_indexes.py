@@ -0,0 +1,61 @@
+"""task filter indexes
+
+Revision ID: 1ebda00c9bec
+Revises: aefba1e52bde
+Create Date: 2026-10-16 17:31:40.885120
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "1ebda00c9bec"
+down_revision: Union[str, Sequence[str], None] = "aefba1e52bde"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ("ix_tasks_priority_id", "tasks", ["priority", "id"], None),
+    (
+        "ix_tasks_modified_at_id",
+        "tasks",
+        [sa.text("coalesce(updated_at, created_at)"), "id"],
+        None,
+    ),
+    (
+        "ix_tasks_completed_at",
+        "tasks",
+        ["completed_at"],
+        sa.text("completed_at IS NOT NULL"),
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=where,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
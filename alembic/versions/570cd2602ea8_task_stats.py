@@ -0,0 +1,130 @@
+"""task stats
+
+Revision ID: 570cd2602ea8
+Revises: 1ebda00c9bec
+Create Date: 2026-10-16 18:41:27.305916
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "570cd2602ea8"
+down_revision: Union[str, Sequence[str], None] = "1ebda00c9bec"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing types from the initial revision
+TASK_STATUS = postgresql.ENUM(name="taskstatus", create_type=False)
+TASK_PRIORITY = postgresql.ENUM(name="taskpriority", create_type=False)
+
+FUNCTIONS = """
+    CREATE OR REPLACE FUNCTION task_stats_bucket(
+        status taskstatus, created_at timestamptz, completed_at timestamptz
+    ) RETURNS smallint LANGUAGE sql IMMUTABLE AS $$
+        SELECT CASE
+            WHEN status <> 'COMPLETED' OR completed_at IS NULL
+                OR created_at IS NULL THEN -1
+            ELSE floor(log(2, greatest(
+                extract(epoch FROM completed_at - created_at), 1
+            )::numeric))::smallint
+        END
+    $$;
+
+    CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE')
+                AND OLD.status IS NOT NULL AND OLD.priority IS NOT NULL THEN
+            UPDATE task_stats SET task_count = task_count - 1
+            WHERE creator_id = OLD.creator_id
+                AND status = OLD.status
+                AND priority = OLD.priority
+                AND completion_bucket = task_stats_bucket(
+                    OLD.status, OLD.created_at, OLD.completed_at
+                );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE')
+                AND NEW.status IS NOT NULL AND NEW.priority IS NOT NULL THEN
+            INSERT INTO task_stats AS s (
+                creator_id, status, priority, completion_bucket, task_count
+            )
+            VALUES (
+                NEW.creator_id,
+                NEW.status,
+                NEW.priority,
+                task_stats_bucket(NEW.status, NEW.created_at, NEW.completed_at),
+                1
+            )
+            ON CONFLICT (creator_id, status, priority, completion_bucket)
+            DO UPDATE SET task_count = s.task_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+    $$;
+"""
+
+TRIGGERS = """
+    CREATE OR REPLACE TRIGGER task_stats_insert_delete
+    AFTER INSERT OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_stats_apply();
+
+    CREATE OR REPLACE TRIGGER task_stats_update
+    AFTER UPDATE OF creator_id, status, priority, created_at, completed_at ON tasks
+    FOR EACH ROW
+    WHEN (
+        (OLD.creator_id, OLD.status, OLD.priority, OLD.created_at, OLD.completed_at)
+        IS DISTINCT FROM
+        (NEW.creator_id, NEW.status, NEW.priority, NEW.created_at, NEW.completed_at)
+    )
+    EXECUTE FUNCTION task_stats_apply();
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_stats",
+        sa.Column("creator_id", sa.Integer(), nullable=False),
+        sa.Column("status", TASK_STATUS, nullable=False),
+        sa.Column("priority", TASK_PRIORITY, nullable=False),
+        sa.Column("completion_bucket", sa.SmallInteger(), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint(
+            "creator_id", "status", "priority", "completion_bucket"
+        ),
+    )
+    op.execute(FUNCTIONS)
+    # CREATE TRIGGER holds off writes to tasks until this transaction
+    # commits, so the backfill cannot miss or double-count a concurrent write
+    op.execute(TRIGGERS)
+    op.execute(
+        """
+        INSERT INTO task_stats (
+            creator_id, status, priority, completion_bucket, task_count
+        )
+        SELECT
+            creator_id,
+            status,
+            priority,
+            task_stats_bucket(status, created_at, completed_at),
+            count(*)
+        FROM tasks
+        WHERE status IS NOT NULL AND priority IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER task_stats_update ON tasks")
+    op.execute("DROP TRIGGER task_stats_insert_delete ON tasks")
+    op.execute("DROP FUNCTION task_stats_apply()")
+    op.execute("DROP FUNCTION task_stats_bucket(taskstatus, timestamptz, timestamptz)")
+    op.drop_table("task_stats")
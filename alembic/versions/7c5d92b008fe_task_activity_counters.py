@@ -0,0 +1,77 @@
+"""task activity counters
+
+Revision ID: 7c5d92b008fe
+Revises: d7a04e57f9ae
+Create Date: 2026-10-16 16:02:11.648210
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "7c5d92b008fe"
+down_revision: Union[str, Sequence[str], None] = "d7a04e57f9ae"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant and stable defaults make these metadata-only on Postgres 11+
+    op.add_column(
+        "tasks",
+        sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("assignee_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "last_activity_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE tasks SET comment_count = c.n
+        FROM (SELECT task_id, count(*) AS n FROM comments GROUP BY task_id) c
+        WHERE tasks.id = c.task_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE tasks SET assignee_count = a.n
+        FROM (
+            SELECT task_id, count(*) AS n FROM task_assignments GROUP BY task_id
+        ) a
+        WHERE tasks.id = a.task_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE tasks SET last_activity_at = greatest(
+            tasks.created_at,
+            tasks.updated_at,
+            tasks.completed_at,
+            (SELECT max(created_at) FROM comments WHERE task_id = tasks.id),
+            (
+                SELECT max(assigned_at) FROM task_assignments
+                WHERE task_id = tasks.id
+            )
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "last_activity_at")
+    op.drop_column("tasks", "assignee_count")
+    op.drop_column("tasks", "comment_count")
@@ -0,0 +1,89 @@
+"""full text search
+
+Revision ID: aefba1e52bde
+Revises: 7c5d92b008fe
+Create Date: 2026-10-16 16:48:25.301577
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "aefba1e52bde"
+down_revision: Union[str, Sequence[str], None] = "7c5d92b008fe"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A')"
+    " || setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+COMMENT_VECTOR = "to_tsvector('english', content)"
+
+# (name, table, columns, postgresql_ops)
+INDEXES = [
+    ("ix_tasks_search_vector", "tasks", ["search_vector"], None),
+    ("ix_comments_search_vector", "comments", ["search_vector"], None),
+]
+TRGM_INDEX = ("ix_tasks_title_trgm", "tasks", ["title"], {"title": "gin_trgm_ops"})
+
+
+def _pg_trgm_available() -> bool:
+    query = "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    return op.get_bind().execute(sa.text(query)).first() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table under an
+    # exclusive lock; schedule this revision for a quiet window
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(TASK_VECTOR, persisted=True),
+        ),
+    )
+    op.add_column(
+        "comments",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(COMMENT_VECTOR, persisted=True),
+        ),
+    )
+    indexes = list(INDEXES)
+    # Title autocomplete needs pg_trgm from the standard contrib package
+    if _pg_trgm_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        indexes.append(TRGM_INDEX)
+    with op.get_context().autocommit_block():
+        for name, table, columns, ops in indexes:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_using="gin",
+                postgresql_ops=ops or {},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in [TRGM_INDEX, *reversed(INDEXES)]:
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.drop_column("comments", "search_vector")
+    op.drop_column("tasks", "search_vector")
@@ -0,0 +1,72 @@
+"""hot path indexes
+
+Revision ID: b447ef7bcd5a
+Revises: 733866945380
+Create Date: 2026-10-16 09:12:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "b447ef7bcd5a"
+down_revision: Union[str, Sequence[str], None] = "733866945380"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, unique)
+INDEXES = [
+    ("ix_tasks_creator_id_status", "tasks", ["creator_id", "status"], False),
+    ("ix_tasks_status", "tasks", ["status"], False),
+    (
+        "ix_task_assignments_task_id_assigned_user_id",
+        "task_assignments",
+        ["task_id", "assigned_user_id"],
+        True,
+    ),
+    (
+        "ix_task_assignments_assigned_user_id_task_id",
+        "task_assignments",
+        ["assigned_user_id", "task_id"],
+        False,
+    ),
+    ("ix_comments_task_id_created_at", "comments", ["task_id", "created_at"], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicate assignments would make the unique index build fail
+    op.execute(
+        """
+        DELETE FROM task_assignments a
+        USING task_assignments b
+        WHERE a.task_id = b.task_id
+          AND a.assigned_user_id = b.assigned_user_id
+          AND a.id > b.id
+        """
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,47 @@
+"""keyset pagination indexes
+
+Revision ID: e1cf07034645
+Revises: b447ef7bcd5a
+Create Date: 2026-10-16 11:40:03.227915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "e1cf07034645"
+down_revision: Union[str, Sequence[str], None] = "b447ef7bcd5a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+INDEXES = [
+    ("ix_tasks_created_at_id", "tasks", ["created_at", "id"]),
+    ("ix_users_created_at_id", "users", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
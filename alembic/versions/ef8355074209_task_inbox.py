@@ -0,0 +1,130 @@
+"""task inbox
+
+Revision ID: ef8355074209
+Revises: 570cd2602ea8
+Create Date: 2026-10-16 19:20:53.417062
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op  # type: ignore
+
+# revision identifiers, used by Alembic.
+revision: str = "ef8355074209"
+down_revision: Union[str, Sequence[str], None] = "570cd2602ea8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FUNCTIONS = """
+    CREATE OR REPLACE FUNCTION task_inbox_add_creator() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO task_inbox (user_id, task_id, last_activity_at)
+        VALUES (NEW.creator_id, NEW.id, NEW.last_activity_at)
+        ON CONFLICT DO NOTHING;
+        RETURN NULL;
+    END
+    $$;
+
+    CREATE OR REPLACE FUNCTION task_inbox_touch() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE task_inbox SET last_activity_at = NEW.last_activity_at
+        WHERE task_id = NEW.id;
+        RETURN NULL;
+    END
+    $$;
+
+    CREATE OR REPLACE FUNCTION task_inbox_add_assignee() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO task_inbox (user_id, task_id, last_activity_at)
+        SELECT NEW.assigned_user_id, tasks.id, tasks.last_activity_at
+        FROM tasks WHERE tasks.id = NEW.task_id
+        ON CONFLICT DO NOTHING;
+        RETURN NULL;
+    END
+    $$;
+
+    CREATE OR REPLACE FUNCTION task_inbox_remove_assignee() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        DELETE FROM task_inbox USING tasks
+        WHERE task_inbox.user_id = OLD.assigned_user_id
+            AND task_inbox.task_id = OLD.task_id
+            AND tasks.id = OLD.task_id
+            AND tasks.creator_id <> OLD.assigned_user_id;
+        RETURN NULL;
+    END
+    $$;
+"""
+
+TRIGGERS = """
+    CREATE OR REPLACE TRIGGER task_inbox_add_creator
+    AFTER INSERT ON tasks
+    FOR EACH ROW EXECUTE FUNCTION task_inbox_add_creator();
+
+    CREATE OR REPLACE TRIGGER task_inbox_touch
+    AFTER UPDATE OF last_activity_at ON tasks
+    FOR EACH ROW
+    WHEN (OLD.last_activity_at IS DISTINCT FROM NEW.last_activity_at)
+    EXECUTE FUNCTION task_inbox_touch();
+
+    CREATE OR REPLACE TRIGGER task_inbox_add_assignee
+    AFTER INSERT ON task_assignments
+    FOR EACH ROW EXECUTE FUNCTION task_inbox_add_assignee();
+
+    CREATE OR REPLACE TRIGGER task_inbox_remove_assignee
+    AFTER DELETE ON task_assignments
+    FOR EACH ROW EXECUTE FUNCTION task_inbox_remove_assignee();
+"""
+
+# (trigger, table)
+TRIGGER_TABLES = [
+    ("task_inbox_add_creator", "tasks"),
+    ("task_inbox_touch", "tasks"),
+    ("task_inbox_add_assignee", "task_assignments"),
+    ("task_inbox_remove_assignee", "task_assignments"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_inbox",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "task_id"),
+    )
+    op.create_index(
+        "ix_task_inbox_user_id_activity",
+        "task_inbox",
+        ["user_id", "last_activity_at", "task_id"],
+    )
+    op.create_index("ix_task_inbox_task_id", "task_inbox", ["task_id"])
+    op.execute(FUNCTIONS)
+    # CREATE TRIGGER holds off writes to both tables until this transaction
+    # commits, so the backfill cannot miss a concurrent create or assign
+    op.execute(TRIGGERS)
+    op.execute(
+        """
+        INSERT INTO task_inbox (user_id, task_id, last_activity_at)
+        SELECT creator_id, id, last_activity_at FROM tasks
+        UNION
+        SELECT a.assigned_user_id, t.id, t.last_activity_at
+        FROM task_assignments a JOIN tasks t ON t.id = a.task_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger, table in reversed(TRIGGER_TABLES):
+        op.execute(f"DROP TRIGGER {trigger} ON {table}")
+        op.execute(f"DROP FUNCTION {trigger}()")
+    op.drop_table("task_inbox")
@@ -4,10 +4,10 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
 
 from app.core import crud_user, security
-from app.database import get_db
+from app.core.principal_cache import principal_cache
+from app.database import DBSession, get_session, mark_write, run_db
 from app.models.user import User as UserModel
 from app.schemas.user import Token, User, UserCreate
 
@@ -16,46 +16,59 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)
+async def get_current_user(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    db: DBSession = Depends(get_session),
 ) -> UserModel:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # Entries never outlive the token's exp, so a hit is already verified
+    user = principal_cache.get(token, db)
+    if user is not None:
+        return user
     payload = security.decode_access_token(token)
     if payload is None or "sub" not in payload:
         raise credentials_exception
     email: str = payload["sub"]
-    user = crud_user.get_user_by_email(db, email=email)
-    if user is None:
+    user = await run_db(db, crud_user.get_user_by_email, email)
+    if user is None or not user.is_active:
         raise credentials_exception
+    principal_cache.put(token, user, payload.get("exp"))
     return user
 
 
-@router.post("/register", response_model=User, status_code=201)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
-    if crud_user.get_user_by_email(db, user_in.email):
+@router.post(
+    "/register",
+    response_model=User,
+    status_code=201,
+    dependencies=[Depends(mark_write)],
+)
+async def register(user_in: UserCreate, db: DBSession = Depends(get_session)):
+    if await run_db(db, crud_user.get_user_by_email, user_in.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    if crud_user.get_user_by_username(db, user_in.username):
+    if await run_db(db, crud_user.get_user_by_username, user_in.username):
         raise HTTPException(status_code=400, detail="Username already taken")
-    user = crud_user.create_user(db, user_in)
+    user = await crud_user.create_user_async(db, user_in)
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
 ):
-    user = crud_user.authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+    user = await crud_user.authenticate_user_async(
+        db, form_data.username, form_data.password
+    )
+    if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Incorrect email or password")
     access_token = security.create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=User)
-def read_users_me(current_user: Annotated[UserModel, Depends(get_current_user)]):
+async def read_users_me(current_user: Annotated[UserModel, Depends(get_current_user)]):
     return current_user
@@ -1,83 +1,129 @@
 """Comment API endpoints."""
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 from app.api.auth import get_current_user
-from app.database import get_db
+from app.config import settings
+from app.core import crud_comment, crud_task
+from app.core.etags import etag_matches, not_modified
+from app.core.fast_json import RowShape, sparse_fields
+from app.core.pagination import PageParams
+from app.core.read_cache import (
+    CachedResponse,
+    cached_response,
+    comments_key,
+    read_cache,
+    task_keys,
+)
+from app.database import DBSession, get_read_session, get_session, mark_write, run_db
 from app.models.comment import Comment as CommentModel
-from app.models.task import Task as TaskModel
 from app.models.user import User as UserModel
 from app.schemas.comment import Comment, CommentCreate, CommentUpdate
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
+COMMENT_ROWS = RowShape(CommentModel, Comment)
+COMMENT_FIELDS = sparse_fields(COMMENT_ROWS)
+
 
 @router.get("/task/{task_id}", response_model=List[Comment])
-def get_comments_for_task(
+async def get_comments_for_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: DBSession = Depends(get_read_session),
+    primary: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
+    page: PageParams = Depends(),
+    shape: RowShape = Depends(COMMENT_FIELDS),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
+    # Clients poll the first full page; anything else goes to the database.
+    # Misses load from the primary so a lagging replica never fills the cache
+    first_page = page.after is None and page.limit == settings.page_size_default
+    if first_page and not shape.partial:
+        entry = await read_cache.get_or_load(
+            comments_key(task_id), lambda: _load_comments(primary, task_id, page)
+        )
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return cached_response(request, entry)
+    if request.headers.get("if-none-match"):
+        rows, next_cursor = await run_db(
+            db, crud_comment.list_comment_versions, task_id, page
+        )
+        etag = shape.etag(rows, next_cursor)
+        # An empty page still has to tell a missing task apart
+        if rows and etag_matches(request, etag):
+            return not_modified(etag)
+    entry = await _load_comments(db, task_id, page, shape)
+    if entry is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    comments = db.query(CommentModel).filter(CommentModel.task_id == task_id).all()
-    return comments
+    return cached_response(request, entry)
+
+
+async def _load_comments(
+    db: DBSession, task_id: int, page: PageParams, shape: RowShape = COMMENT_ROWS
+) -> Optional[CachedResponse]:
+    comments, next_cursor = await run_db(
+        db, crud_comment.list_comments, shape, task_id, page
+    )
+    # An empty page is the only case where the task might not exist
+    if not comments and not await run_db(db, crud_task.task_exists, task_id):
+        return None
+    etag = shape.etag(comments, next_cursor)
+    return CachedResponse(shape.encode(comments), etag, next_cursor)
 
 
-@router.post("/task/{task_id}", response_model=Comment, status_code=201)
-def add_comment(
+@router.post(
+    "/task/{task_id}",
+    response_model=Comment,
+    status_code=201,
+    dependencies=[Depends(mark_write)],
+)
+async def add_comment(
     task_id: int,
     comment_in: CommentCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    comment = CommentModel(
-        content=comment_in.content,
-        task_id=task_id,
-        author_id=current_user.id,
+    comment = await run_db(
+        db, crud_comment.create_comment, comment_in, task_id, current_user.id
     )
-    db.add(comment)
-    db.commit()
-    db.refresh(comment)
+    if comment is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    await read_cache.invalidate(*task_keys(task_id))
     return comment
 
 
-@router.put("/{comment_id}", response_model=Comment)
-def update_comment(
+@router.put("/{comment_id}", response_model=Comment, dependencies=[Depends(mark_write)])
+async def update_comment(
     comment_id: int,
     comment_in: CommentUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    comment = db.query(CommentModel).filter(CommentModel.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    if comment.author_id != current_user.id:
+    comment = await run_db(
+        db, crud_comment.update_comment, comment_id, comment_in, current_user.id
+    )
+    if comment is None:
+        if not await run_db(db, crud_comment.get_comment, comment_id):
+            raise HTTPException(status_code=404, detail="Comment not found")
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    comment.content = comment_in.content  # type: ignore[assignment]
-    db.commit()
-    db.refresh(comment)
+    await read_cache.invalidate(comments_key(comment["task_id"]))
     return comment
 
 
-@router.delete("/{comment_id}", status_code=204)
-def delete_comment(
+@router.delete("/{comment_id}", status_code=204, dependencies=[Depends(mark_write)])
+async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    comment = db.query(CommentModel).filter(CommentModel.id == comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=404, detail="Comment not found")
-    if comment.author_id != current_user.id:
+    task_id = await run_db(db, crud_comment.delete_comment, comment_id, current_user.id)
+    if task_id is None:
+        if not await run_db(db, crud_comment.get_comment, comment_id):
+            raise HTTPException(status_code=404, detail="Comment not found")
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    db.delete(comment)
-    db.commit()
+    await read_cache.invalidate(*task_keys(task_id))
     return None
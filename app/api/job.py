@@ -0,0 +1,24 @@
+"""Job API endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.auth import get_current_user
+from app.core import jobs
+from app.database import DBSession, get_session, run_db
+from app.models.user import User as UserModel
+from app.schemas.job import Job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(
+    job_id: int,
+    db: DBSession = Depends(get_session),
+    current_user: UserModel = Depends(get_current_user),
+):
+    job = await run_db(db, jobs.get_job, job_id)
+    # Other users' jobs are indistinguishable from missing ones
+    if not job or (job.created_by_id != current_user.id and not current_user.is_admin):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,38 @@
+"""Metrics endpoint for scraping."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.invalidation import bus
+from app.core.metrics import pool_samples, render_prometheus
+from app.core.principal_cache import principal_cache
+from app.core.read_cache import read_cache
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Connection pool and cache statistics in Prometheus text format.
+
+    Returns:
+        str: One sample per line
+    """
+    samples = pool_samples()
+    cache = principal_cache.stats()
+    samples["principal_cache_hits_total"] = [({}, cache["hits"])]
+    samples["principal_cache_misses_total"] = [({}, cache["misses"])]
+    samples["principal_cache_evictions_total"] = [({}, cache["evictions"])]
+    samples["principal_cache_size"] = [({}, cache["size"])]
+    reads = read_cache.stats()
+    samples["read_cache_hits_total"] = [({}, reads["hits"])]
+    samples["read_cache_misses_total"] = [({}, reads["misses"])]
+    samples["read_cache_coalesced_total"] = [({}, reads["coalesced"])]
+    samples["read_cache_errors_total"] = [({}, reads["errors"])]
+    samples["read_cache_hit_ratio"] = [({}, reads["hit_ratio"])]
+    if bus.running:
+        samples["cache_invalidation_connected"] = [({}, int(bus.connected))]
+        samples["cache_invalidation_received_total"] = [({}, bus.received)]
+        samples["cache_invalidation_reconnects_total"] = [({}, bus.reconnects)]
+    return render_prometheus(samples)
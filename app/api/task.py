@@ -1,201 +1,499 @@
 """Task API endpoints."""
 
-from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
 from app.api.auth import get_current_user
-from app.database import get_db
+from app.config import settings
+from app.core import crud_task, jobs
+from app.core.access import require_task_member
+from app.core.etags import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    row_versions,
+    task_versions,
+)
+from app.core.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    encode_csv,
+    encode_csv_header,
+    encode_ndjson,
+)
+from app.core.fast_json import RowShape, sparse_fields
+from app.core.includes import TaskIncludes
+from app.core.pagination import PageParams, SortOrder, set_next_page
+from app.core.read_cache import (
+    CachedResponse,
+    cached_response,
+    read_cache,
+    task_key,
+    task_keys,
+)
+from app.core.task_filters import TaskFilters
+from app.database import (
+    DBSession,
+    get_read_session,
+    get_session,
+    mark_write,
+    run_db,
+    stream_db,
+)
 from app.models.task import Task as TaskModel
 from app.models.task import TaskAssignment as TaskAssignmentModel
 from app.models.task import TaskStatus
 from app.models.user import User as UserModel
+from app.schemas.job import Job
 from app.schemas.task import (
     Task,
     TaskAssignment,
+    TaskAssignmentBulkCreate,
+    TaskAssignmentBulkResult,
     TaskAssignmentCreate,
+    TaskBulkCreate,
+    TaskBulkError,
+    TaskBulkResult,
     TaskCreate,
+    TaskExpanded,
+    TaskSearchResult,
+    TaskSort,
+    TaskStats,
+    TaskStatsScope,
+    TaskSuggestion,
     TaskUpdate,
 )
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+TASK_ROWS = RowShape(TaskModel, Task)
+ASSIGNMENT_ROWS = RowShape(TaskAssignmentModel, TaskAssignment)
+TASK_FIELDS = sparse_fields(TASK_ROWS)
+
 
-@router.post("/", response_model=Task, status_code=201)
-def create_task(
+@router.post(
+    "/", response_model=Task, status_code=201, dependencies=[Depends(mark_write)]
+)
+async def create_task(
     task_in: TaskCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = TaskModel(
-        title=task_in.title,
-        description=task_in.description,
-        priority=task_in.priority,
-        creator_id=current_user.id,
-    )
-    db.add(task)
-    db.commit()
-    db.refresh(task)
+    task = await run_db(db, crud_task.create_task, task_in, current_user.id)
     return task
 
 
-@router.get("/", response_model=List[Task])
-def list_tasks(
-    db: Session = Depends(get_db),
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResult,
+    status_code=201,
+    responses={202: {"model": Job, "description": "Queued with ?background=true"}},
+    dependencies=[Depends(mark_write)],
+)
+async def create_tasks_bulk(
+    bulk_in: TaskBulkCreate,
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
-    status: Optional[TaskStatus] = Query(None),
-    assigned: Optional[bool] = Query(None),
+    background: bool = Query(False),
 ):
-    query = db.query(TaskModel)
-    if status:
-        query = query.filter(TaskModel.status == status)
-    if assigned is not None:
-        if assigned:
-            query = query.join(TaskAssignmentModel).filter(
-                TaskAssignmentModel.assigned_user_id == current_user.id
+    """Create many tasks in one INSERT.
+
+    With ``background`` the batch is validated, queued as a job and
+    answered with 202; any invalid item rejects it, as there is no later
+    response to report partial failures in.
+    """
+    if len(bulk_in.tasks) > settings.bulk_create_max_tasks:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.bulk_create_max_tasks} tasks per request",
+        )
+    tasks_in: List[TaskCreate] = []
+    errors: List[TaskBulkError] = []
+    for index, item in enumerate(bulk_in.tasks):
+        try:
+            tasks_in.append(TaskCreate.model_validate(item))
+        except ValidationError as e:
+            errors.append(
+                TaskBulkError(
+                    index=index,
+                    errors=[
+                        dict(error)
+                        for error in e.errors(include_url=False, include_context=False)
+                    ],
+                )
             )
-        else:
-            query = query.filter(TaskModel.creator_id == current_user.id)
-    return query.all()
+    if errors and (bulk_in.atomic or background):
+        raise HTTPException(
+            status_code=422, detail=[error.model_dump() for error in errors]
+        )
+    if background:
+        payload = {
+            "creator_id": current_user.id,
+            "tasks": [task_in.model_dump(mode="json") for task_in in tasks_in],
+        }
+        job = await run_db(db, jobs.enqueue, "create_tasks", payload, current_user.id)
+        return JSONResponse(
+            status_code=202,
+            content=Job.model_validate(job).model_dump(mode="json"),
+            headers={"Location": f"/jobs/{job['id']}"},
+        )
+    created = []
+    if tasks_in:
+        created = await run_db(db, crud_task.create_tasks, tasks_in, current_user.id)
+    return {"created": created, "errors": errors}
+
+
+@router.get("/", response_model=List[TaskExpanded], response_model_exclude_unset=True)
+async def list_tasks(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_session),
+    current_user: UserModel = Depends(get_current_user),
+    filters: TaskFilters = Depends(),
+    sort: TaskSort = Query(TaskSort.CREATED_AT),
+    order: SortOrder = Query(SortOrder.ASC),
+    page: PageParams = Depends(),
+    includes: TaskIncludes = Depends(),
+    shape: RowShape = Depends(TASK_FIELDS),
+):
+    _check_fields(shape, includes)
+    if request.headers.get("if-none-match") and not includes.items:
+        rows, next_cursor = await run_db(
+            db,
+            crud_task.list_task_versions,
+            current_user.id,
+            page,
+            filters,
+            sort,
+            order,
+        )
+        etag = shape.etag(rows, next_cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    if not includes.items:
+        rows, next_cursor = await run_db(
+            db,
+            crud_task.list_task_rows,
+            shape,
+            current_user.id,
+            page,
+            filters,
+            sort,
+            order,
+        )
+        etag = shape.etag(rows, next_cursor)
+        entry = CachedResponse(shape.encode(rows), etag, next_cursor)
+        return cached_response(request, entry)
+    tasks, next_cursor = await run_db(
+        db,
+        crud_task.list_tasks,
+        current_user.id,
+        page,
+        filters,
+        sort,
+        order,
+        includes.items,
+    )
+    etag = make_etag(task_versions(tasks) + [next_cursor])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    set_next_page(request, response, next_cursor)
+    return tasks
+
+
+@router.get(
+    "/inbox", response_model=List[TaskExpanded], response_model_exclude_unset=True
+)
+async def list_inbox(
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_session),
+    current_user: UserModel = Depends(get_current_user),
+    page: PageParams = Depends(),
+    includes: TaskIncludes = Depends(),
+):
+    """Tasks the caller created or is assigned, most recently active first."""
+    tasks, next_cursor = await run_db(
+        db, crud_task.list_inbox, current_user.id, page, includes.items
+    )
+    set_next_page(request, response, next_cursor)
+    return tasks
+
+
+@router.get("/stats", response_model=TaskStats)
+async def task_stats(
+    scope: TaskStatsScope = Query(TaskStatsScope.MINE),
+    db: DBSession = Depends(get_read_session),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Counts, completion rate and latency for the caller's tasks.
+
+    Admins can pass ``scope=all`` for every user's tasks.
+    """
+    if scope == TaskStatsScope.ALL:
+        if not current_user.is_admin:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        return await run_db(db, crud_task.task_stats)
+    return await run_db(db, crud_task.task_stats, current_user.id)
+
+
+@router.get("/search", response_model=List[TaskSearchResult])
+async def search_tasks(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=256),
+    db: DBSession = Depends(get_read_session),
+    current_user: UserModel = Depends(get_current_user),
+    status: Optional[TaskStatus] = Query(None),
+    include_comments: bool = Query(False),
+    page: PageParams = Depends(),
+):
+    """Full-text search over titles and descriptions, best matches first.
+
+    ``q`` uses web search syntax: quoted phrases, ``or`` and ``-word``.
+    """
+    # Search cursors carry the numeric rank rather than a column value
+    if page.after is not None and not isinstance(page.after[0], (int, float)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    tasks, next_cursor = await run_db(
+        db, crud_task.search_tasks, q, page, status, include_comments
+    )
+    set_next_page(request, response, next_cursor)
+    return tasks
+
+
+@router.get("/autocomplete", response_model=List[TaskSuggestion])
+async def autocomplete_titles(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+    db: DBSession = Depends(get_read_session),
+    current_user: UserModel = Depends(get_current_user),
+):
+    """Typo-tolerant title suggestions for a prefix."""
+    return await run_db(db, crud_task.suggest_titles, q, limit)
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    db: DBSession = Depends(get_read_session),
+    current_user: UserModel = Depends(get_current_user),
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    filters: TaskFilters = Depends(),
+):
+    """Stream every matching task with its assignee ids in constant memory."""
+    stmt = crud_task.export_tasks_query(int(current_user.id), filters)
+    columns = [c.name for c in stmt.selected_columns]
+
+    # The session dependency stays open until the response has been sent
+    async def body():
+        if format == ExportFormat.CSV:
+            yield encode_csv_header(columns)
+        async for batch in stream_db(db, stmt, settings.export_batch_size):
+            if format == ExportFormat.CSV:
+                yield encode_csv(batch)
+            else:
+                yield encode_ndjson(columns, batch)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'},
+    )
 
 
-@router.get("/{task_id}", response_model=Task)
-def get_task(
+@router.get(
+    "/{task_id}", response_model=TaskExpanded, response_model_exclude_unset=True
+)
+async def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_session),
+    primary: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
+    includes: TaskIncludes = Depends(),
+    shape: RowShape = Depends(TASK_FIELDS),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
+    _check_fields(shape, includes)
+    if shape.partial:
+        row = await run_db(db, crud_task.get_task_row, shape, task_id)
+        if row is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        etag = shape.etag([row])
+        return cached_response(request, CachedResponse(shape.encode_row(row), etag))
+    if not includes.items:
+        # Misses load from the primary so a lagging replica never fills the cache
+        entry = await read_cache.get_or_load(
+            task_key(task_id), lambda: _load_task(primary, task_id)
+        )
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return cached_response(request, entry)
+    task = await run_db(db, crud_task.get_task_expanded, task_id, includes.items)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    etag = make_etag(task_versions([task]))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return task
 
 
-@router.put("/{task_id}", response_model=Task)
-def update_task(
+async def _load_task(db: DBSession, task_id: int) -> Optional[CachedResponse]:
+    task = await run_db(db, crud_task.get_task_expanded, task_id)
+    if task is None:
+        return None
+    body = Task.model_validate(task).model_dump_json().encode()
+    return CachedResponse(body, make_etag(task_versions([task])))
+
+
+def _check_fields(shape: RowShape, includes: TaskIncludes):
+    # Included resources are rendered through the full task schema
+    if shape.partial and includes.items:
+        raise HTTPException(
+            status_code=400, detail="fields cannot be combined with include"
+        )
+
+
+async def _raise_task_denied(db: DBSession, task_id: int, user_id: int):
+    """Explain why a creator-only write produced no row."""
+    task = await run_db(db, crud_task.get_task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if task.creator_id != user_id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+
+@router.put("/{task_id}", response_model=Task, dependencies=[Depends(mark_write)])
+async def update_task(
     task_id: int,
     task_in: TaskUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.creator_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    for field, value in task_in.model_dump(exclude_unset=True).items():
-        setattr(task, field, value)
-    db.commit()
-    db.refresh(task)
+    user_id = int(current_user.id)
+    task = await run_db(db, crud_task.update_task, task_id, task_in, user_id)
+    if task is None:
+        await _raise_task_denied(db, task_id, user_id)
+    await read_cache.invalidate(task_key(task_id))
     return task
 
 
-@router.delete("/{task_id}", status_code=204)
-def delete_task(
+@router.delete("/{task_id}", status_code=204, dependencies=[Depends(mark_write)])
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.creator_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    db.delete(task)
-    db.commit()
+    user_id = int(current_user.id)
+    if not await run_db(db, crud_task.delete_task, task_id, user_id):
+        await _raise_task_denied(db, task_id, user_id)
+    await read_cache.invalidate(*task_keys(task_id))
     return None
 
 
-@router.post("/{task_id}/assign", response_model=TaskAssignment)
-def assign_task(
+@router.post(
+    "/{task_id}/assign",
+    response_model=TaskAssignment,
+    dependencies=[Depends(mark_write)],
+)
+async def assign_task(
     task_id: int,
     assignment_in: TaskAssignmentCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.creator_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    # Prevent duplicate assignment
-    existing = (
-        db.query(TaskAssignmentModel)
-        .filter(
-            TaskAssignmentModel.task_id == task_id,
-            TaskAssignmentModel.assigned_user_id == assignment_in.assigned_user_id,
-        )
-        .first()
+    user_id = assignment_in.assigned_user_id
+    created = await run_db(
+        db, crud_task.assign_users, task_id, [user_id], current_user.id
     )
-    if existing:
+    if created:
+        await read_cache.invalidate(task_key(task_id))
+        return created[0]
+    await _raise_task_denied(db, task_id, int(current_user.id))
+    if await run_db(db, crud_task.assigned_user_ids, task_id, [user_id]):
         raise HTTPException(
             status_code=400, detail="User already assigned to this task"
         )
-    assignment = TaskAssignmentModel(
-        task_id=task_id,
-        assigned_user_id=assignment_in.assigned_user_id,
-        assigned_by_id=current_user.id,
+    raise HTTPException(status_code=404, detail="User not found")
+
+
+@router.post(
+    "/{task_id}/assign/bulk",
+    response_model=TaskAssignmentBulkResult,
+    dependencies=[Depends(mark_write)],
+)
+async def assign_task_bulk(
+    task_id: int,
+    bulk_in: TaskAssignmentBulkCreate,
+    db: DBSession = Depends(get_session),
+    current_user: UserModel = Depends(get_current_user),
+):
+    user_ids = list(dict.fromkeys(bulk_in.assigned_user_ids))
+    if len(user_ids) > settings.bulk_assign_max_users:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.bulk_assign_max_users} users per request",
+        )
+    created = await run_db(
+        db, crud_task.assign_users, task_id, user_ids, current_user.id
     )
-    db.add(assignment)
-    db.commit()
-    db.refresh(assignment)
-    return assignment
+    if created:
+        await read_cache.invalidate(task_key(task_id))
+    else:
+        await _raise_task_denied(db, task_id, int(current_user.id))
+        if not user_ids:
+            return {"created": [], "already_assigned": [], "not_found": []}
+    created_ids = {row["assigned_user_id"] for row in created}
+    remaining = [uid for uid in user_ids if uid not in created_ids]
+    already_assigned = []
+    if remaining:
+        already_assigned = sorted(
+            await run_db(db, crud_task.assigned_user_ids, task_id, remaining)
+        )
+    return {
+        "created": created,
+        "already_assigned": already_assigned,
+        "not_found": sorted(set(remaining) - set(already_assigned)),
+    }
 
 
 @router.get("/{task_id}/assignments", response_model=List[TaskAssignment])
-def list_assignments(
+async def list_assignments(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: DBSession = Depends(get_read_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
     # Only creator or assigned users can view assignments
-    is_assigned = (
-        db.query(TaskAssignmentModel)
-        .filter(
-            TaskAssignmentModel.task_id == task_id,
-            TaskAssignmentModel.assigned_user_id == current_user.id,
-        )
-        .first()
+    access = await require_task_member(
+        request, db, task_id, int(current_user.id), with_assignments=True
     )
-    if task.creator_id != current_user.id and not is_assigned:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    assignments = (
-        db.query(TaskAssignmentModel)
-        .filter(TaskAssignmentModel.task_id == task_id)
-        .all()
+    assignments = access.task.assignments
+    entry = CachedResponse(
+        ASSIGNMENT_ROWS.encode_objects(assignments),
+        make_etag(row_versions(assignments)),
     )
-    return assignments
+    return cached_response(request, entry)
 
 
-@router.post("/{task_id}/complete", response_model=Task)
-def complete_task(
+@router.post(
+    "/{task_id}/complete", response_model=Task, dependencies=[Depends(mark_write)]
+)
+async def complete_task(
     task_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
     # Only creator or assigned user can complete
-    is_assigned = (
-        db.query(TaskAssignmentModel)
-        .filter(
-            TaskAssignmentModel.task_id == task_id,
-            TaskAssignmentModel.assigned_user_id == current_user.id,
-        )
-        .first()
-    )
-    if task.creator_id != current_user.id and not is_assigned:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    if task.status == TaskStatus.COMPLETED:
+    await require_task_member(request, db, task_id, int(current_user.id))
+    task = await run_db(db, crud_task.complete_task, task_id)
+    if task is None:
         raise HTTPException(status_code=400, detail="Task is already completed")
-    task.status = TaskStatus.COMPLETED  # type: ignore[assignment]
-    task.completed_at = datetime.now()  # type: ignore[assignment]
-    db.commit()
-    db.refresh(task)
+    await read_cache.invalidate(task_key(task_id))
     return task
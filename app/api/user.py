@@ -2,57 +2,76 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from app.api.auth import get_current_user
-from app.database import get_db
+from app.core import crud_user
+from app.core.fast_json import RowShape, sparse_fields
+from app.core.pagination import PageParams, set_next_page
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash_async
+from app.database import DBSession, get_read_session, get_session, mark_write, run_db
 from app.models.user import User as UserModel
+from app.schemas.job import Job
 from app.schemas.user import User, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+USER_ROWS = RowShape(UserModel, User)
+USER_FIELDS = sparse_fields(USER_ROWS)
+
 
 @router.get("/me", response_model=User)
-def get_me(current_user: UserModel = Depends(get_current_user)):
-    return current_user
+async def get_me(
+    current_user: UserModel = Depends(get_current_user),
+    shape: RowShape = Depends(USER_FIELDS),
+):
+    # The caller is already loaded, so fields only trims the response
+    return Response(shape.encode_object(current_user), media_type="application/json")
 
 
 @router.get("/", response_model=List[User])
-def list_users(
-    current_user: UserModel = Depends(get_current_user), db: Session = Depends(get_db)
+async def list_users(
+    request: Request,
+    current_user: UserModel = Depends(get_current_user),
+    db: DBSession = Depends(get_read_session),
+    page: PageParams = Depends(),
+    shape: RowShape = Depends(USER_FIELDS),
 ):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
-    users = db.query(UserModel).all()
-    return users
+    users, next_cursor = await run_db(db, crud_user.list_users, shape, page)
+    response = Response(shape.encode(users), media_type="application/json")
+    set_next_page(request, response, next_cursor)
+    return response
 
 
-@router.put("/me", response_model=User)
-def update_me(
+@router.put("/me", response_model=User, dependencies=[Depends(mark_write)])
+async def update_me(
     update: UserUpdate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: UserModel = Depends(get_current_user),
 ):
-    if update.email:
-        current_user.email = update.email  # type: ignore[assignment]
-    if update.username:
-        current_user.username = update.username  # type: ignore[assignment]
+    hashed_password = None
     if update.password:
-        from app.core.security import get_password_hash
-
-        current_user.hashed_password = (  # type: ignore[assignment]
-            get_password_hash(update.password)  # type: ignore[assignment]
-        )
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+        hashed_password = await get_password_hash_async(update.password)
+    user_id = int(current_user.id)
+    user = await run_db(db, crud_user.update_user, user_id, update, hashed_password)
+    principal_cache.invalidate_user(user_id)
+    return user
 
 
-@router.delete("/me", status_code=204)
-def delete_me(
-    db: Session = Depends(get_db), current_user: UserModel = Depends(get_current_user)
+@router.delete(
+    "/me", response_model=Job, status_code=202, dependencies=[Depends(mark_write)]
+)
+async def delete_me(
+    response: Response,
+    db: DBSession = Depends(get_session),
+    current_user: UserModel = Depends(get_current_user),
 ):
-    db.delete(current_user)
-    db.commit()
-    return None
+    """Deactivate the account now; a background job deletes it and its data."""
+    user_id = int(current_user.id)
+    job = await run_db(db, crud_user.schedule_delete_user, user_id)
+    principal_cache.invalidate_user(user_id)
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return job
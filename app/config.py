@@ -1,5 +1,7 @@
 """Configuration settings for the application."""
 
+from typing import List
+
 from pydantic_settings import BaseSettings
 
 
@@ -16,11 +18,72 @@ class Settings(BaseSettings):
     db_port: str = "5432"  # External port for host access
     postgres_host: str = "localhost"
 
+    # Serve requests through the asyncpg engine instead of the psycopg2 one
+    use_async_db: bool = False
+
+    # Connection pool (applies to each engine)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800  # seconds, -1 disables
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 leaves the server default
+
+    # Read replicas (JSON list of URLs); reads stick to the primary for
+    # read_your_writes_seconds after a client's last write
+    database_replica_urls: List[str] = []
+    read_your_writes_seconds: int = 5
+    replica_health_check_seconds: int = 10
+
     # JWT
     secret_key: str = "your-secret-key-here-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # Principal cache (skips the user lookup on authenticated requests)
+    principal_cache_size: int = 10000  # 0 disables the cache
+    principal_cache_ttl_seconds: int = 60
+
+    # Read-through cache of task and comment responses: "local" (per
+    # process), "redis" (shared, at cache_url) or "none"
+    cache_backend: str = "local"
+    cache_url: str = "redis://localhost:6379/0"
+    cache_size: int = 10000
+    cache_ttl_seconds: int = 30
+    cache_timeout_seconds: float = 0.5
+
+    # Cross-worker invalidation of the in-process caches over LISTEN/NOTIFY;
+    # enable when running several workers with the local cache backend
+    cache_invalidation_enabled: bool = False
+    cache_invalidation_channel: str = "cache_invalidation"
+    cache_fallback_ttl_seconds: int = 5
+    cache_listener_retry_seconds: float = 1.0
+
+    # Password hashing process pool
+    password_hash_workers: int = 2
+    password_hash_queue_depth: int = 64
+    password_hash_retry_after_seconds: int = 1
+
+    # Pagination
+    page_size_default: int = 50
+    page_size_max: int = 200
+
+    # Rows fetched per server-side cursor round trip in streaming exports
+    export_batch_size: int = 1000
+
+    # Largest batches accepted by POST /tasks/bulk and /tasks/{id}/assign/bulk
+    bulk_create_max_tasks: int = 500
+    bulk_assign_max_users: int = 500
+
+    # Background job queue (python -m app.worker)
+    job_worker_concurrency: int = 4  # jobs run in parallel per worker process
+    job_claim_batch_size: int = 10  # jobs claimed per SKIP LOCKED round trip
+    job_poll_interval_seconds: float = 1.0  # idle sleep between empty claims
+    job_visibility_timeout_seconds: int = 300  # a claim expires after this
+    job_max_attempts: int = 5
+    job_backoff_base_seconds: float = 2.0  # doubled after each failed attempt
+    job_backoff_max_seconds: float = 600.0
+
     # API
     title: str = "Task Management System"
     description: str = "A comprehensive task management API with user authentication"
@@ -45,6 +108,13 @@ class Settings(BaseSettings):
             # Use the default database_url
             return self.database_url
 
+    @property
+    def get_async_database_url(self) -> str:
+        """Get database URL for the asyncpg driver."""
+        return self.get_database_url.replace(
+            "postgresql://", "postgresql+asyncpg://", 1
+        )
+
     class Config:
         env_file = ".env"
         case_sensitive = False
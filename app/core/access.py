@@ -0,0 +1,102 @@
+"""Task-scoped access checks resolved in a single query."""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import DBSession, run_db
+from app.models.task import Task, TaskAssignment
+
+
+@dataclass
+class TaskAccess:
+    """A loaded task and the caller's relationship to it."""
+
+    task: Task
+    is_creator: bool
+    is_assignee: bool
+    assignments_loaded: bool = False
+
+    @property
+    def is_member(self) -> bool:
+        return self.is_creator or self.is_assignee
+
+
+def load_task_access(
+    db: Session, task_id: int, user_id: int, with_assignments: bool = False
+) -> Optional[TaskAccess]:
+    """Load the task and the caller's membership in one round trip.
+
+    Membership comes from an EXISTS subquery, or, when the handler needs
+    the assignment list anyway, from the eagerly joined assignments.
+    """
+    if with_assignments:
+        loaded = db.scalars(
+            select(Task).options(joinedload(Task.assignments)).where(Task.id == task_id)
+        ).first()
+        if loaded is None:
+            return None
+        task = loaded
+        is_assignee = any(a.assigned_user_id == user_id for a in task.assignments)
+    else:
+        is_assignee_expr = (
+            select(TaskAssignment.id)
+            .where(
+                TaskAssignment.task_id == Task.id,
+                TaskAssignment.assigned_user_id == user_id,
+            )
+            .exists()
+        )
+        row = db.execute(
+            select(Task, is_assignee_expr).where(Task.id == task_id)
+        ).first()
+        if row is None:
+            return None
+        task, is_assignee = row
+    return TaskAccess(
+        task=task,
+        is_creator=bool(task.creator_id == user_id),
+        is_assignee=bool(is_assignee),
+        assignments_loaded=with_assignments,
+    )
+
+
+async def get_task_access(
+    request: Request,
+    db: DBSession,
+    task_id: int,
+    user_id: int,
+    with_assignments: bool = False,
+) -> Optional[TaskAccess]:
+    """``load_task_access`` memoized for the lifetime of the request."""
+    memo: Dict[Tuple[int, int], Optional[TaskAccess]] = (
+        getattr(request.state, "task_access", None) or {}
+    )
+    request.state.task_access = memo
+    key = (task_id, user_id)
+    if key in memo:
+        access = memo[key]
+        if access is None or access.assignments_loaded or not with_assignments:
+            return access
+    access = await run_db(db, load_task_access, task_id, user_id, with_assignments)
+    memo[key] = access
+    return access
+
+
+async def require_task_member(
+    request: Request,
+    db: DBSession,
+    task_id: int,
+    user_id: int,
+    with_assignments: bool = False,
+) -> TaskAccess:
+    """404 for a missing task, 403 unless the caller created or is assigned."""
+    access = await get_task_access(request, db, task_id, user_id, with_assignments)
+    if access is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not access.is_member:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    return access
@@ -0,0 +1,114 @@
+"""CRUD operations for Comment model."""
+
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.orm import Session
+
+from app.core.fast_json import RowShape
+from app.core.pagination import PageParams, paginate
+from app.models.comment import Comment
+from app.models.search import result_columns
+from app.models.task import Task
+from app.schemas.comment import CommentCreate, CommentUpdate
+
+
+def get_comment(db: Session, comment_id: int) -> Optional[Comment]:
+    return db.query(Comment).filter(Comment.id == comment_id).first()
+
+
+def list_comments(
+    db: Session, shape: RowShape, task_id: int, page: PageParams
+) -> Tuple[List[Row], Optional[str]]:
+    """A page of the task's comments as rows of ``shape``'s columns.
+
+    Rows also carry ``id``, ``xmin`` and ``created_at`` for the cursor and
+    the ETag.
+    """
+    columns = shape.select(Comment.id, Comment.xmin, Comment.created_at)
+    query = db.query(*columns).filter(Comment.task_id == task_id)
+    return paginate(query, Comment, page)
+
+
+def list_comment_versions(
+    db: Session, task_id: int, page: PageParams
+) -> Tuple[List[Row], Optional[str]]:
+    """``(id, xmin)`` of the rows ``list_comments`` would return, for ETags.
+
+    The next cursor comes along since it is part of the tag.
+    """
+    query = db.query(Comment.id, Comment.xmin, Comment.created_at)
+    return paginate(query.filter(Comment.task_id == task_id), Comment, page)
+
+
+def create_comment(
+    db: Session, comment_in: CommentCreate, task_id: int, author_id: int
+) -> Optional[RowMapping]:
+    """Insert the comment if the task exists; None means it does not.
+
+    The task's counter update and the insert are one statement: the insert
+    selects from the updated row, so a missing task yields neither.
+    """
+    bump = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(
+            comment_count=Task.comment_count + 1,
+            last_activity_at=func.now(),
+            updated_at=Task.updated_at,
+        )
+        .returning(Task.id)
+        .cte("bump")
+    )
+    source = select(literal(comment_in.content), bump.c.id, literal(author_id))
+    stmt = (
+        insert(Comment)
+        .from_select(["content", "task_id", "author_id"], source)
+        .returning(*result_columns(Comment))
+        .add_cte(bump)
+    )
+    comment = db.execute(stmt).mappings().first()
+    db.commit()
+    return comment
+
+
+def update_comment(
+    db: Session, comment_id: int, comment_in: CommentUpdate, author_id: int
+) -> Optional[RowMapping]:
+    """Edit a comment written by ``author_id``; None if missing or not theirs."""
+    stmt = (
+        update(Comment)
+        .where(Comment.id == comment_id, Comment.author_id == author_id)
+        .values(content=comment_in.content)
+        .returning(*result_columns(Comment))
+        .execution_options(synchronize_session=False)
+    )
+    comment = db.execute(stmt).mappings().first()
+    db.commit()
+    return comment
+
+
+def delete_comment(db: Session, comment_id: int, author_id: int) -> Optional[int]:
+    """Delete a comment written by ``author_id`` and return its task's id.
+
+    None if missing or not theirs. The delete and the counter update are
+    one statement, so only the request that removed the row decrements.
+    """
+    deleted = (
+        delete(Comment)
+        .where(Comment.id == comment_id, Comment.author_id == author_id)
+        .returning(Comment.task_id)
+        .cte("deleted")
+    )
+    stmt = (
+        update(Task)
+        .where(Task.id.in_(select(deleted.c.task_id)))
+        .values(comment_count=Task.comment_count - 1, updated_at=Task.updated_at)
+        .returning(Task.id)
+        .add_cte(deleted)
+        .execution_options(synchronize_session=False)
+    )
+    task_id = db.execute(stmt).scalar()
+    db.commit()
+    return task_id
@@ -0,0 +1,418 @@
+"""CRUD operations for Task and TaskAssignment models."""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, literal, or_, select, tuple_, union, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.fast_json import RowShape
+from app.core.includes import Includes, expand_tasks, include_options
+from app.core.pagination import PageParams, SortOrder, encode_cursor, paginate
+from app.core.task_filters import SORT_KEYS, TaskFilters
+from app.models.comment import Comment
+from app.models.search import pg_trgm_installed, result_columns, search_config
+from app.models.task import Task, TaskAssignment, TaskPriority, TaskStatus
+from app.models.task_inbox import TaskInbox
+from app.models.task_stats import NOT_COMPLETED, TaskStats
+from app.models.user import User
+from app.schemas.task import TaskCreate, TaskSort, TaskUpdate
+
+LATENCY_PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def get_task(db: Session, task_id: int) -> Optional[Task]:
+    return db.query(Task).filter(Task.id == task_id).first()
+
+
+def task_exists(db: Session, task_id: int) -> bool:
+    return bool(db.scalar(select(select(Task.id).where(Task.id == task_id).exists())))
+
+
+def list_tasks(
+    db: Session,
+    user_id: int,
+    page: PageParams,
+    filters: TaskFilters,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    order: SortOrder = SortOrder.ASC,
+    includes: Includes = frozenset(),
+) -> Tuple[List[Dict], Optional[str]]:
+    query = db.query(Task).options(*include_options(includes))
+    query = query.filter(*filters.clauses(user_id))
+    tasks, next_cursor = paginate(query, Task, page, SORT_KEYS[sort], order)
+    return expand_tasks(db, tasks, includes), next_cursor
+
+
+def list_task_rows(
+    db: Session,
+    shape: RowShape,
+    user_id: int,
+    page: PageParams,
+    filters: TaskFilters,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    order: SortOrder = SortOrder.ASC,
+) -> Tuple[List[Row], Optional[str]]:
+    """``list_tasks`` without includes, as rows of ``shape``'s columns.
+
+    Rows also carry ``id``, ``xmin`` and the sort key for the cursor and
+    the ETag.
+    """
+    key = SORT_KEYS[sort]
+    query = db.query(*shape.select(Task.id, Task.xmin, key))
+    query = query.filter(*filters.clauses(user_id))
+    return paginate(query, Task, page, key, order)
+
+
+def list_task_versions(
+    db: Session,
+    user_id: int,
+    page: PageParams,
+    filters: TaskFilters,
+    sort: TaskSort = TaskSort.CREATED_AT,
+    order: SortOrder = SortOrder.ASC,
+) -> Tuple[List[Row], Optional[str]]:
+    """``(id, xmin)`` of the rows ``list_tasks`` would return, for ETags.
+
+    The next cursor comes along since it is part of the tag.
+    """
+    key = SORT_KEYS[sort]
+    query = db.query(Task.id, Task.xmin, key).filter(*filters.clauses(user_id))
+    return paginate(query, Task, page, key, order)
+
+
+def list_inbox(
+    db: Session, user_id: int, page: PageParams, includes: Includes = frozenset()
+) -> Tuple[List[Dict], Optional[str]]:
+    """Tasks ``user_id`` created or is assigned, most recently active first."""
+    query = (
+        db.query(Task)
+        .options(*include_options(includes))
+        .join(TaskInbox, TaskInbox.task_id == Task.id)
+        .filter(TaskInbox.user_id == user_id)
+    )
+    tasks, next_cursor = paginate(
+        query,
+        Task,
+        page,
+        TaskInbox.last_activity_at,
+        SortOrder.DESC,
+        id_key=TaskInbox.task_id,
+    )
+    return expand_tasks(db, tasks, includes), next_cursor
+
+
+def get_task_expanded(
+    db: Session, task_id: int, includes: Includes = frozenset()
+) -> Optional[Dict]:
+    query = db.query(Task).options(*include_options(includes))
+    task = query.filter(Task.id == task_id).first()
+    return expand_tasks(db, [task], includes)[0] if task else None
+
+
+def get_task_row(db: Session, shape: RowShape, task_id: int) -> Optional[Row]:
+    """The task's ``shape`` columns, plus ``id`` and ``xmin`` for the ETag."""
+    stmt = select(*shape.select(Task.id, Task.xmin)).where(Task.id == task_id)
+    return db.execute(stmt).first()
+
+
+def task_stats(db: Session, creator_id: Optional[int] = None) -> Dict:
+    """Aggregates for ``creator_id``'s tasks, or everyone's when None.
+
+    Reads the trigger-maintained ``task_stats`` rows, whose number is
+    bounded by creators x statuses x priorities x latency buckets rather
+    than by the number of tasks.
+    """
+    stmt = select(
+        TaskStats.status,
+        TaskStats.priority,
+        TaskStats.completion_bucket,
+        func.sum(TaskStats.task_count),
+    ).group_by(TaskStats.status, TaskStats.priority, TaskStats.completion_bucket)
+    if creator_id is not None:
+        stmt = stmt.where(TaskStats.creator_id == creator_id)
+    by_status = dict.fromkeys(TaskStatus, 0)
+    by_priority = dict.fromkeys(TaskPriority, 0)
+    buckets: Dict[int, int] = {}
+    for status, priority, bucket, count in db.execute(stmt):
+        by_status[status] += count
+        by_priority[priority] += count
+        if bucket != NOT_COMPLETED:
+            buckets[bucket] = buckets.get(bucket, 0) + count
+    total = sum(by_status.values())
+    completed = by_status[TaskStatus.COMPLETED]
+    return {
+        "total": total,
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "completion_rate": completed / total if total else 0.0,
+        "completion_latency_seconds": {
+            name: _bucket_percentile(buckets, fraction)
+            for name, fraction in LATENCY_PERCENTILES.items()
+        },
+    }
+
+
+def _bucket_percentile(buckets: Dict[int, int], fraction: float) -> Optional[float]:
+    # Upper bound of the first bucket whose cumulative count reaches it
+    remaining = fraction * sum(buckets.values())
+    for bucket in sorted(buckets):
+        remaining -= buckets[bucket]
+        if remaining <= 0:
+            return float(2 ** (bucket + 1))
+    return None
+
+
+def search_tasks(
+    db: Session,
+    q: str,
+    page: PageParams,
+    status: Optional[TaskStatus] = None,
+    include_comments: bool = False,
+) -> Tuple[List[RowMapping], Optional[str]]:
+    """Full-text search ranked by relevance, paginated on ``(rank, id)``.
+
+    The cursor's sort value must already be checked to be a number.
+
+    Matches come from the GIN index on ``tasks.search_vector`` and, with
+    ``include_comments``, ``comments.search_vector``; tasks matched only by
+    a comment rank lowest.
+    """
+    tsquery = func.websearch_to_tsquery(search_config, q)
+    rank = func.ts_rank_cd(Task.search_vector, tsquery)
+    match = Task.search_vector.op("@@")(tsquery)
+    if include_comments:
+        match = Task.id.in_(
+            union(
+                select(Task.id).where(match),
+                select(Comment.task_id).where(Comment.search_vector.op("@@")(tsquery)),
+            )
+        )
+    stmt = select(*result_columns(Task), rank.label("rank")).where(match)
+    if status:
+        stmt = stmt.where(Task.status == status)
+    if page.after is not None:
+        value, id = page.after
+        after = tuple_(literal(float(value)), literal(id))
+        stmt = stmt.where(tuple_(rank, Task.id) < after)
+    stmt = stmt.order_by(rank.desc(), Task.id.desc()).limit(page.limit + 1)
+    rows = db.execute(stmt).mappings().all()
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor(rows[-1]["rank"], rows[-1]["id"])
+    return list(rows), next_cursor
+
+
+def suggest_titles(db: Session, prefix: str, limit: int) -> List[RowMapping]:
+    """Titles starting with ``prefix`` or close to it, for autocomplete.
+
+    Both predicates are served by the pg_trgm GIN index on ``title``:
+    ILIKE for exact prefixes and ``%>`` (word similarity) for typos. Where
+    pg_trgm is not installed only exact prefixes match.
+    """
+    pattern = re.sub(r"([\\%_])", r"\\\1", prefix) + "%"
+    match = Task.title.ilike(pattern, escape="\\")
+    stmt = select(Task.id, Task.title)
+    if pg_trgm_installed(db):
+        closeness = func.word_similarity(prefix, Task.title)
+        stmt = stmt.where(or_(match, Task.title.op("%>")(prefix))).order_by(
+            closeness.desc(), Task.id
+        )
+    else:
+        stmt = stmt.where(match).order_by(Task.title, Task.id)
+    return list(db.execute(stmt.limit(limit)).mappings().all())
+
+
+def export_tasks_query(user_id: int, filters: TaskFilters) -> Select:
+    """Flat task rows plus their assignee ids, for streaming export."""
+    assignee_ids = func.array(
+        select(TaskAssignment.assigned_user_id)
+        .where(TaskAssignment.task_id == Task.id)
+        .order_by(TaskAssignment.assigned_user_id)
+        .scalar_subquery()
+    ).label("assignee_ids")
+    stmt = select(
+        Task.id,
+        Task.title,
+        Task.description,
+        Task.status,
+        Task.priority,
+        Task.creator_id,
+        Task.created_at,
+        Task.updated_at,
+        Task.completed_at,
+        assignee_ids,
+    )
+    return stmt.where(*filters.clauses(user_id)).order_by(Task.id)
+
+
+def create_task(db: Session, task_in: TaskCreate, creator_id: int) -> RowMapping:
+    stmt = (
+        insert(Task)
+        .values(**task_in.model_dump(), creator_id=creator_id)
+        .returning(*result_columns(Task))
+    )
+    task = db.execute(stmt).mappings().one()
+    db.commit()
+    return task
+
+
+def create_tasks(
+    db: Session, tasks_in: List[TaskCreate], creator_id: int
+) -> List[RowMapping]:
+    """Insert all tasks in one statement and return the stored rows."""
+    rows = [{**task_in.model_dump(), "creator_id": creator_id} for task_in in tasks_in]
+    stmt = insert(Task).returning(*result_columns(Task), sort_by_parameter_order=True)
+    created = db.execute(stmt, rows).mappings().all()
+    db.commit()
+    return list(created)
+
+
+def update_task(
+    db: Session, task_id: int, task_in: TaskUpdate, creator_id: int
+) -> Optional[RowMapping]:
+    """Apply ``task_in`` to a task created by ``creator_id``.
+
+    None means the task is missing or belongs to someone else.
+    """
+    where = (Task.id == task_id, Task.creator_id == creator_id)
+    values = task_in.model_dump(exclude_unset=True)
+    if not values:
+        return (
+            db.execute(select(*result_columns(Task)).where(*where)).mappings().first()
+        )
+    stmt = (
+        update(Task)
+        .where(*where)
+        .values(**values, last_activity_at=func.now())
+        .returning(*result_columns(Task))
+        .execution_options(synchronize_session=False)
+    )
+    task = db.execute(stmt).mappings().first()
+    db.commit()
+    return task
+
+
+def complete_task(db: Session, task_id: int) -> Optional[RowMapping]:
+    """Mark the task completed; None means it already was."""
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.status != TaskStatus.COMPLETED)
+        .values(
+            status=TaskStatus.COMPLETED,
+            completed_at=func.now(),
+            last_activity_at=func.now(),
+        )
+        .returning(*result_columns(Task))
+        .execution_options(synchronize_session=False)
+    )
+    task = db.execute(stmt).mappings().first()
+    db.commit()
+    return task
+
+
+def delete_task(db: Session, task_id: int, creator_id: int) -> bool:
+    """Delete a task created by ``creator_id`` in one statement.
+
+    Comments and assignments go with it through ON DELETE CASCADE. False
+    means the task is missing or belongs to someone else.
+    """
+    stmt = (
+        delete(Task)
+        .where(Task.id == task_id, Task.creator_id == creator_id)
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.execute(stmt).first() is not None
+    db.commit()
+    return deleted
+
+
+def assign_users(
+    db: Session, task_id: int, user_ids: List[int], assigned_by_id: int
+) -> List[RowMapping]:
+    """Assign ``user_ids`` to a task created by ``assigned_by_id``.
+
+    One ``INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING``: rows are
+    only produced when the task exists, belongs to the caller and the user
+    exists, and the unique (task_id, assigned_user_id) index makes
+    concurrent duplicates no-ops. A sibling CTE in the same statement adds
+    the inserted rows to the task's ``assignee_count``. Returns the newly
+    inserted assignments.
+    """
+    source = (
+        select(Task.id, User.id, literal(assigned_by_id))
+        .select_from(Task)
+        .join(User, User.id.in_(user_ids))
+        .where(Task.id == task_id, Task.creator_id == assigned_by_id)
+    )
+    inserted = (
+        pg_insert(TaskAssignment)
+        .from_select(["task_id", "assigned_user_id", "assigned_by_id"], source)
+        .on_conflict_do_nothing(index_elements=["task_id", "assigned_user_id"])
+        .returning(*TaskAssignment.__table__.columns)
+        .cte("inserted")
+    )
+    added = select(func.count()).select_from(inserted).scalar_subquery()
+    bump = (
+        update(Task)
+        .where(Task.id == task_id, select(inserted.c.id).exists())
+        .values(
+            assignee_count=Task.assignee_count + added,
+            last_activity_at=func.now(),
+            updated_at=Task.updated_at,
+        )
+        .cte("bump")
+    )
+    stmt = select(*inserted.c).add_cte(bump)
+    created = db.execute(stmt).mappings().all()
+    db.commit()
+    return list(created)
+
+
+def refresh_task_counters(db: Session, task_ids: List[int]) -> None:
+    """Recompute the denormalized counters of ``task_ids`` from scratch.
+
+    For writes that remove comments or assignments in bulk (user deletion)
+    where incremental maintenance is impractical. Does not commit.
+    """
+    if not task_ids:
+        return
+    comment_count = (
+        select(func.count())
+        .where(Comment.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    assignee_count = (
+        select(func.count())
+        .where(TaskAssignment.task_id == Task.id)
+        .correlate(Task)
+        .scalar_subquery()
+    )
+    db.execute(
+        update(Task)
+        .where(Task.id.in_(task_ids))
+        .values(
+            comment_count=comment_count,
+            assignee_count=assignee_count,
+            updated_at=Task.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def assigned_user_ids(db: Session, task_id: int, user_ids: List[int]) -> List[int]:
+    """Which of ``user_ids`` are already assigned to the task."""
+    return list(
+        db.scalars(
+            select(TaskAssignment.assigned_user_id).where(
+                TaskAssignment.task_id == task_id,
+                TaskAssignment.assigned_user_id.in_(user_ids),
+            )
+        )
+    )
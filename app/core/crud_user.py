@@ -1,12 +1,26 @@
 """CRUD operations for User model."""
 
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import delete, insert, select, union, update
+from sqlalchemy.engine import Row, RowMapping
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.crud_task import refresh_task_counters
+from app.core.fast_json import RowShape
+from app.core.jobs import enqueue
+from app.core.pagination import PageParams, paginate
+from app.core.security import (
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
+from app.database import DBSession, run_db
+from app.models.comment import Comment
+from app.models.task import Task, TaskAssignment
 from app.models.user import User
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserUpdate
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -17,21 +31,129 @@ def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
-    hashed_password = get_password_hash(user_in.password)
-    db_user = User(
-        email=user_in.email,
-        username=user_in.username,
-        hashed_password=hashed_password,
+def list_users(
+    db: Session, shape: RowShape, page: PageParams
+) -> Tuple[List[Row], Optional[str]]:
+    """A page of users as rows of ``shape``'s columns (plus the cursor's)."""
+    return paginate(db.query(*shape.select(User.id, User.created_at)), User, page)
+
+
+def create_user(
+    db: Session, user_in: UserCreate, hashed_password: Optional[str] = None
+) -> RowMapping:
+    if hashed_password is None:
+        hashed_password = get_password_hash(user_in.password)
+    stmt = (
+        insert(User)
+        .values(
+            email=user_in.email,
+            username=user_in.username,
+            hashed_password=hashed_password,
+        )
+        .returning(*User.__table__.columns)
     )
-    db.add(db_user)
+    db_user = db.execute(stmt).mappings().one()
     db.commit()
-    db.refresh(db_user)
     return db_user
 
 
+def update_user(
+    db: Session,
+    user_id: int,
+    user_in: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> Optional[RowMapping]:
+    values = {}
+    if user_in.email:
+        values["email"] = user_in.email
+    if user_in.username:
+        values["username"] = user_in.username
+    if hashed_password:
+        values["hashed_password"] = hashed_password
+    if not values:
+        return (
+            db.execute(select(*User.__table__.columns).where(User.id == user_id))
+            .mappings()
+            .first()
+        )
+    stmt = (
+        update(User)
+        .where(User.id == user_id)
+        .values(**values)
+        .returning(*User.__table__.columns)
+        .execution_options(synchronize_session=False)
+    )
+    user = db.execute(stmt).mappings().first()
+    db.commit()
+    return user
+
+
+def delete_user(db: Session, user_id: int) -> List[int]:
+    """Delete the user and, via ON DELETE CASCADE, everything they own.
+
+    That is the tasks they created (with those tasks' comments and
+    assignments), their comments elsewhere and their own assignments. The
+    counters of other users' tasks that lose rows are then recomputed.
+    Returns the ids of the deleted and recounted tasks.
+    """
+    deleted = list(db.scalars(select(Task.id).where(Task.creator_id == user_id)))
+    touched = union(
+        select(Comment.task_id).where(Comment.author_id == user_id),
+        select(TaskAssignment.task_id).where(
+            TaskAssignment.assigned_user_id == user_id
+        ),
+    ).subquery()
+    task_ids = list(
+        db.scalars(
+            select(Task.id).where(
+                Task.id.in_(select(touched.c.task_id)), Task.creator_id != user_id
+            )
+        )
+    )
+    stmt = (
+        delete(User)
+        .where(User.id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(stmt)
+    refresh_task_counters(db, task_ids)
+    db.commit()
+    return deleted + task_ids
+
+
+def schedule_delete_user(db: Session, user_id: int) -> RowMapping:
+    """Deactivate the user now and enqueue the cascading delete.
+
+    Both happen in one transaction, so the account stops authenticating
+    exactly when the job becomes visible to workers.
+    """
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(is_active=False)
+        .execution_options(synchronize_session=False)
+    )
+    job = enqueue(db, "delete_user", {"user_id": user_id}, user_id, commit=False)
+    db.commit()
+    return job
+
+
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user or not verify_password(password, str(user.hashed_password)):
         return None
     return user
+
+
+async def create_user_async(db: DBSession, user_in: UserCreate) -> RowMapping:
+    hashed_password = await get_password_hash_async(user_in.password)
+    return await run_db(db, create_user, user_in, hashed_password)
+
+
+async def authenticate_user_async(
+    db: DBSession, email: str, password: str
+) -> Optional[User]:
+    user = await run_db(db, get_user_by_email, email)
+    if not user or not await verify_password_async(password, str(user.hashed_password)):
+        return None
+    return user
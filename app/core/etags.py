@@ -0,0 +1,60 @@
+"""Entity tags and conditional GETs for read endpoints.
+
+A tag hashes the ``(id, xmin)`` pair of every row that makes up a response.
+Postgres gives a row a new ``xmin`` on each write, so any change to those
+rows, or to which rows are on the page, yields a new tag. Endpoints can
+therefore answer ``If-None-Match`` from a narrow ``(id, xmin)`` probe
+without loading or serializing the full rows.
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, List
+
+from fastapi import Request, Response
+
+from app.schemas.task import TaskInclude
+
+
+def make_etag(versions: Iterable[Any]) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for version in versions:
+        digest.update(f"{version}|".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def row_versions(rows: Iterable[Any]) -> List[Any]:
+    """Flatten rows (ORM objects or ``(id, xmin)`` rows) into versions."""
+    return [part for row in rows for part in (row.id, row.xmin)]
+
+
+def task_versions(tasks: Iterable[Dict]) -> List[Any]:
+    """Versions of expanded tasks, including whatever they embed.
+
+    For tasks without includes this equals ``row_versions`` of their rows.
+    """
+    versions: List[Any] = []
+    for task in tasks:
+        versions += [task["id"], task["xmin"]]
+        for include in TaskInclude:
+            related = task.get(include.value)
+            if related is None:
+                continue
+            versions.append(include.value)
+            versions += row_versions(
+                related if isinstance(related, list) else [related]
+            )
+    return versions
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether ``If-None-Match`` lists ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,55 @@
+"""Row encoders for streaming exports."""
+
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, Sequence
+
+
+class ExportFormat(str, enum.Enum):
+    """Export output format."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps({c: _plain(v) for c, v in zip(columns, row)}) + "\n" for row in rows
+    )
+
+
+def encode_csv(rows: Iterable[Sequence[Any]]) -> str:
+    """CSV lines for ``rows``; list values are joined with ``;``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        values: List[Any] = []
+        for value in row:
+            if isinstance(value, list):
+                value = ";".join(str(v) for v in value)
+            values.append(_plain(value))
+        writer.writerow(values)
+    return buffer.getvalue()
+
+
+def encode_csv_header(columns: Sequence[str]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
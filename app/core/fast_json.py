@@ -0,0 +1,118 @@
+"""List responses encoded straight from column tuples with orjson.
+
+Returning ORM objects through ``response_model`` validates every item with
+``from_attributes`` and then encodes the result with the stdlib ``json``.
+List handlers instead select only the columns a response schema declares
+and hand the rows to orjson, producing the same bytes without building a
+model per item. Values are trusted to fit the schema, which the columns'
+types and constraints already guarantee.
+
+Read endpoints also take ``?fields=`` to narrow a shape: only the named
+columns are selected, so large ones such as ``description`` are never
+read unless asked for.
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+from app.core.etags import make_etag, row_versions
+
+# Pydantic renders UTC datetimes with a "Z" suffix rather than "+00:00"
+OPTIONS = orjson.OPT_UTC_Z
+
+
+class RowShape:
+    """The model columns behind a response schema's fields, in field order.
+
+    A shape built with ``fields`` covers only that subset of the schema.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        schema: Type[BaseModel],
+        fields: Optional[Iterable[str]] = None,
+    ):
+        self.model = model
+        self.schema = schema
+        wanted = set(schema.model_fields if fields is None else fields)
+        self.fields: Tuple[str, ...] = tuple(
+            name for name in schema.model_fields if name in wanted
+        )
+        self.partial = len(self.fields) < len(schema.model_fields)
+        self.columns: List[Any] = [getattr(model, name) for name in self.fields]
+        get = attrgetter(*self.fields)
+        self._get: Callable[[Any], Tuple[Any, ...]] = get
+        if len(self.fields) == 1:
+            self._get = lambda obj: (get(obj),)
+
+    def only(self, fields: Iterable[str]) -> "RowShape":
+        return RowShape(self.model, self.schema, fields)
+
+    def select(self, *extra: Any) -> List[Any]:
+        """``columns`` followed by each of ``extra`` not already among them.
+
+        Extras (keyset and version columns) come last, so ``encode``
+        leaves them out of the payload.
+        """
+        return self.columns + [c for c in extra if c.key not in self.fields]
+
+    def etag(self, rows: Iterable[Any], next_cursor: Optional[str] = None) -> str:
+        """The ETag of ``rows`` rendered in this shape.
+
+        A partial shape is part of the tag, so a client holding one
+        representation is never told another one is unchanged. So is the
+        next page's cursor, which a page gains once rows are added after it.
+        """
+        versions = row_versions(rows)
+        if self.partial:
+            versions.insert(0, ",".join(self.fields))
+        if next_cursor is not None:
+            versions.append(next_cursor)
+        return make_etag(versions)
+
+    def encode(self, rows: Iterable[Sequence[Any]]) -> bytes:
+        """A JSON array with an object per row of ``select``-ed columns."""
+        fields = self.fields
+        return orjson.dumps([dict(zip(fields, row)) for row in rows], option=OPTIONS)
+
+    def encode_objects(self, objects: Iterable[Any]) -> bytes:
+        """``encode`` for already loaded ORM objects."""
+        return self.encode(map(self._get, objects))
+
+    def encode_row(self, row: Sequence[Any]) -> bytes:
+        return orjson.dumps(dict(zip(self.fields, row)), option=OPTIONS)
+
+    def encode_object(self, obj: Any) -> bytes:
+        return self.encode_row(self._get(obj))
+
+
+def sparse_fields(shape: RowShape) -> Callable[..., RowShape]:
+    """Dependency parsing ``fields`` into a subset of ``shape``.
+
+    Unknown names are rejected with a 400; without ``fields`` the whole
+    shape is used.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated subset of: " + ",".join(shape.fields)
+        ),
+    ) -> RowShape:
+        if fields is None:
+            return shape
+        names = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = names.difference(shape.fields)
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {','.join(sorted(unknown))}"
+            )
+        if not names:
+            raise HTTPException(status_code=400, detail="No fields given")
+        return shape.only(names)
+
+    return dependency
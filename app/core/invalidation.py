@@ -0,0 +1,205 @@
+"""Cross-worker invalidation of in-process caches over LISTEN/NOTIFY.
+
+Each worker keeps a dedicated connection that LISTENs on
+``cache_invalidation_channel`` and a second one that publishes; job
+worker processes only publish. Write paths publish the keys they
+invalidated after their transaction commits; every other worker evicts
+those keys from its own caches. Delivery stops
+while the listener is disconnected. The bus then reports itself degraded,
+so caches store new entries for at most ``cache_fallback_ttl_seconds``,
+and it clears every subscriber both when the connection drops and when
+it is re-established, because notifications sent in between are lost.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import psycopg2
+import psycopg2.extensions
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY payloads must stay under 8000 bytes
+MAX_PAYLOAD_BYTES = 7000
+
+Evict = Callable[[List[str]], None]
+Reset = Callable[[], None]
+
+
+class InvalidationBus:
+    """Publishes and receives cache invalidations between processes."""
+
+    def __init__(self, dsn: str, channel: str, fallback_ttl_seconds: float):
+        self.dsn = dsn
+        self.channel = channel
+        self.fallback_ttl_seconds = fallback_ttl_seconds
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.connected = False
+        self.received = 0
+        self.reconnects = 0
+        self._subscribers: Dict[str, Tuple[Evict, Reset]] = {}
+        self._outbox: "queue.Queue[Tuple[str, List[str]]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._listening = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._threads)
+
+    @property
+    def degraded(self) -> bool:
+        """Whether invalidations from other workers may be going missing."""
+        return self.running and self._listening and not self.connected
+
+    def ttl(self, ttl_seconds: float) -> float:
+        """``ttl_seconds``, capped at the fallback while degraded."""
+        if self.degraded:
+            return min(ttl_seconds, self.fallback_ttl_seconds)
+        return ttl_seconds
+
+    def subscribe(self, name: str, evict: Evict, reset: Reset) -> None:
+        """Route invalidations for cache ``name`` to ``evict``.
+
+        ``reset`` must drop everything the cache holds locally.
+        """
+        self._subscribers[name] = (evict, reset)
+
+    def publish(self, name: str, keys: Sequence[str]) -> None:
+        """Queue ``keys`` of cache ``name`` for other workers; never blocks."""
+        if self.running and keys:
+            self._outbox.put((name, list(keys)))
+
+    def start(
+        self, loop: Optional[asyncio.AbstractEventLoop] = None, listen: bool = True
+    ) -> None:
+        """Start the publisher thread and, with ``listen``, the listener.
+
+        With ``loop`` given, callbacks run on it rather than on the
+        listener thread. Processes that only write, like the job worker,
+        can skip listening.
+        """
+        if self.running:
+            return
+        self._loop = loop
+        self._listening = listen
+        self._stop.clear()
+        for target in (self._listen, self._send) if listen else (self._send,):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop both threads once the publisher has sent what is queued."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.connected = False
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    def _listen(self) -> None:
+        first = True
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                if not first:
+                    self.reconnects += 1
+                    self._dispatch_reset()
+                first = False
+                self.connected = True
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self._receive(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.warning("Invalidation listener disconnected", exc_info=True)
+            finally:
+                self.connected = False
+                if conn is not None:
+                    conn.close()
+            # Anything published until the next LISTEN is lost
+            self._dispatch_reset()
+            self._stop.wait(settings.cache_listener_retry_seconds)
+
+    def _send(self) -> None:
+        conn = None
+        while not self._stop.is_set() or not self._outbox.empty():
+            try:
+                name, keys = self._outbox.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            try:
+                if conn is None:
+                    conn = self._connect()
+                with conn.cursor() as cur:
+                    for payload in self._payloads(name, keys):
+                        cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except Exception:
+                # Receivers fall back on their TTLs for what was dropped
+                logger.warning("Publishing invalidations failed", exc_info=True)
+                if conn is not None:
+                    conn.close()
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    def _payloads(self, name: str, keys: List[str]) -> List[str]:
+        payloads: List[str] = []
+        batch: List[str] = []
+        for key in keys:
+            candidate = json.dumps({"o": self.origin, "c": name, "k": batch + [key]})
+            if batch and len(candidate.encode()) > MAX_PAYLOAD_BYTES:
+                payloads.append(json.dumps({"o": self.origin, "c": name, "k": batch}))
+                batch = []
+            batch.append(key)
+        payloads.append(json.dumps({"o": self.origin, "c": name, "k": batch}))
+        return payloads
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed invalidation %r", payload)
+            return
+        if message.get("o") == self.origin:
+            return
+        subscriber = self._subscribers.get(message.get("c"))
+        if subscriber is not None:
+            self.received += 1
+            self._call(subscriber[0], list(message.get("k", [])))
+
+    def _dispatch_reset(self) -> None:
+        for _, reset in self._subscribers.values():
+            self._call(reset)
+
+    def _call(self, fn: Callable, *args) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(fn, *args)
+        else:
+            fn(*args)
+
+
+bus = InvalidationBus(
+    settings.get_database_url,
+    settings.cache_invalidation_channel,
+    settings.cache_fallback_ttl_seconds,
+)
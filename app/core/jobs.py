@@ -0,0 +1,145 @@
+"""Postgres-backed job queue.
+
+Jobs are rows in ``jobs``. Workers claim them with ``FOR UPDATE SKIP LOCKED``
+so any number of workers can poll the same table without blocking each other
+or taking the same job. A claim sets ``locked_until``; a job whose worker
+died becomes claimable again once that passes. Delivery is at-least-once,
+but a handler's database writes commit together with the job's completion
+(see ``app.worker.run_job``), so only effects outside the database have to
+tolerate running twice.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job import Job, JobStatus
+
+# Run by the worker once the job's writes have committed, e.g. to
+# invalidate caches
+AfterCommit = Callable[[], None]
+JobHandler = Callable[[Session, Dict[str, Any]], Optional[AfterCommit]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register ``fn(db, payload)`` as the handler for jobs of ``kind``.
+
+    ``fn`` may return an ``AfterCommit`` callback for effects outside the
+    database that must wait for its writes.
+    """
+
+    def register(fn: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = fn
+        return fn
+
+    return register
+
+
+def enqueue(
+    db: Session,
+    kind: str,
+    payload: Dict[str, Any],
+    created_by_id: Optional[int] = None,
+    run_at: Optional[datetime] = None,
+    commit: bool = True,
+) -> RowMapping:
+    """Insert a job; pass ``commit=False`` to enqueue inside a larger write."""
+    values: Dict[str, Any] = {
+        "kind": kind,
+        "payload": payload,
+        "status": JobStatus.QUEUED,
+        "attempts": 0,
+        "max_attempts": settings.job_max_attempts,
+        "created_by_id": created_by_id,
+    }
+    if run_at is not None:
+        values["run_at"] = run_at
+    stmt = insert(Job).values(**values).returning(*Job.__table__.columns)
+    job = db.execute(stmt).mappings().one()
+    if commit:
+        db.commit()
+    return job
+
+
+def get_job(db: Session, job_id: int) -> Optional[Job]:
+    return db.get(Job, job_id)
+
+
+def claim_jobs(db: Session, limit: int) -> List[RowMapping]:
+    """Claim up to ``limit`` due jobs in one statement.
+
+    Picks queued jobs whose ``run_at`` has passed and running jobs whose
+    claim expired, skipping rows another worker has locked, and marks them
+    running for ``job_visibility_timeout_seconds``.
+    """
+    now = func.now()
+    claimable = (
+        select(Job.id)
+        .where(
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+                and_(Job.status == JobStatus.RUNNING, Job.locked_until < now),
+            )
+        )
+        .order_by(Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("claimable")
+    )
+    stmt = (
+        update(Job)
+        .where(Job.id == claimable.c.id)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            locked_until=now
+            + timedelta(seconds=settings.job_visibility_timeout_seconds),
+        )
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+        .execution_options(synchronize_session=False)
+    )
+    jobs = db.execute(stmt).mappings().all()
+    db.commit()
+    return list(jobs)
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential delay before the next try after ``attempts`` failures."""
+    delay = settings.job_backoff_base_seconds * 2 ** (attempts - 1)
+    return min(delay, settings.job_backoff_max_seconds)
+
+
+def _settle(db: Session, job: RowMapping, **values: Any) -> bool:
+    # ``attempts`` fences the update: if the claim expired and another
+    # worker re-claimed the job, this worker's outcome (and any writes made
+    # in the same transaction) is discarded
+    stmt = (
+        update(Job)
+        .where(Job.id == job["id"], Job.attempts == job["attempts"])
+        .values(locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    settled = db.execute(stmt).rowcount == 1
+    if settled:
+        db.commit()
+    else:
+        db.rollback()
+    return settled
+
+
+def mark_done(db: Session, job: RowMapping) -> bool:
+    return _settle(db, job, status=JobStatus.DONE, last_error=None)
+
+
+def mark_failed(db: Session, job: RowMapping, error: str) -> bool:
+    """Schedule a retry with backoff, or give up after ``max_attempts``."""
+    if job["attempts"] >= job["max_attempts"]:
+        return _settle(db, job, status=JobStatus.FAILED, last_error=error)
+    retry_at = func.now() + timedelta(seconds=backoff_seconds(job["attempts"]))
+    return _settle(db, job, status=JobStatus.QUEUED, run_at=retry_at, last_error=error)
@@ -0,0 +1,128 @@
+"""Connection pool telemetry and Prometheus text rendering."""
+
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+# Checkout wait buckets in seconds
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+
+    def snapshot(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        with self._lock:
+            return list(zip(self.buckets, self.counts)), self.count, self.sum
+
+
+class PoolStats:
+    """Counters recorded by an instrumented pool class."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wait_seconds = Histogram(WAIT_BUCKETS)
+        # "timeout": no connection freed up in time; "connect": the pool
+        # could not open a new one (server down, PgBouncer restarting, ...)
+        self.checkout_failures = {"timeout": 0, "connect": 0}
+        self.pool: Optional[Pool] = None
+
+
+_pool_stats: Dict[str, PoolStats] = {}
+
+
+def instrumented_pool_class(name: str, base: Type[Pool]) -> Type[Pool]:
+    """Return a subclass of ``base`` that records checkout wait and failures.
+
+    Any error raised by a checkout counts as a failure, labelled by kind.
+
+    The stats live on the class, so they survive ``Pool.recreate()``.
+    """
+    stats = _pool_stats.setdefault(name, PoolStats(name))
+
+    def _do_get(self):
+        stats.pool = self
+        start = time.perf_counter()
+        try:
+            return base._do_get(self)  # type: ignore[attr-defined]
+        except exc.TimeoutError:
+            stats.checkout_failures["timeout"] += 1
+            raise
+        except Exception:
+            stats.checkout_failures["connect"] += 1
+            raise
+        finally:
+            stats.wait_seconds.observe(time.perf_counter() - start)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def render_prometheus(samples: Dict[str, List[Tuple[Dict[str, str], float]]]) -> str:
+    """Render ``{metric: [(labels, value), ...]}`` in Prometheus text format."""
+    lines = []
+    for metric, points in samples.items():
+        for labels, value in points:
+            label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            if label_str:
+                label_str = f"{{{label_str}}}"
+            lines.append(f"{metric}{label_str} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def pool_samples() -> Dict[str, List[Tuple[Dict[str, str], float]]]:
+    """Current gauges, counters and wait histogram for every pool."""
+    samples: Dict[str, List[Tuple[Dict[str, str], float]]] = {
+        "db_pool_size": [],
+        "db_pool_checked_out": [],
+        "db_pool_checked_in": [],
+        "db_pool_overflow": [],
+        "db_pool_checkout_failures_total": [],
+        "db_pool_wait_seconds_bucket": [],
+        "db_pool_wait_seconds_sum": [],
+        "db_pool_wait_seconds_count": [],
+    }
+    for name, stats in _pool_stats.items():
+        labels = {"pool": name}
+        pool = stats.pool
+        if pool is not None:
+            samples["db_pool_size"].append((labels, pool.size()))  # type: ignore
+            samples["db_pool_checked_out"].append(
+                (labels, pool.checkedout())  # type: ignore[attr-defined]
+            )
+            samples["db_pool_checked_in"].append(
+                (labels, pool.checkedin())  # type: ignore[attr-defined]
+            )
+            samples["db_pool_overflow"].append(
+                (labels, max(pool.overflow(), 0))  # type: ignore[attr-defined]
+            )
+        for reason, failures in stats.checkout_failures.items():
+            samples["db_pool_checkout_failures_total"].append(
+                ({**labels, "reason": reason}, failures)
+            )
+        buckets, count, total = stats.wait_seconds.snapshot()
+        for bound, bucket_count in buckets:
+            samples["db_pool_wait_seconds_bucket"].append(
+                ({**labels, "le": str(bound)}, bucket_count)
+            )
+        samples["db_pool_wait_seconds_bucket"].append(({**labels, "le": "+Inf"}, count))
+        samples["db_pool_wait_seconds_sum"].append((labels, total))
+        samples["db_pool_wait_seconds_count"].append((labels, count))
+    return samples
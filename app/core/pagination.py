@@ -0,0 +1,116 @@
+"""Keyset (cursor) pagination on ``(sort key, id)``, by default ``created_at``."""
+
+import base64
+import enum
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Request, Response
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query as ORMQuery
+
+from app.config import settings
+
+Key = Tuple[Any, int]
+
+
+class SortOrder(str, enum.Enum):
+    """Sort direction for list endpoints."""
+
+    ASC = "asc"
+    DESC = "desc"
+
+
+def encode_cursor(value: Any, id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, enum.Enum):
+        value = value.value
+    raw = json.dumps([value, id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Key:
+    """Inverse of encode_cursor, with the sort value still in JSON form.
+
+    Raises ValueError on a malformed cursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, id = json.loads(raw)
+        return value, int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _cursor_value(key: Any, value: Any) -> Any:
+    """Convert a decoded cursor value back to ``key``'s Python type."""
+    python_type = key.type.python_type
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        return python_type(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class PageParams:
+    """Query parameters shared by paginated list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.limit = limit
+        self.after: Optional[Key] = None
+        if cursor:
+            try:
+                self.after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    query: ORMQuery,
+    model: Any,
+    page: PageParams,
+    key: Any = None,
+    order: SortOrder = SortOrder.ASC,
+    id_key: Any = None,
+) -> Tuple[List, Optional[str]]:
+    """Return one page of ``query`` and the cursor for the next one.
+
+    Rows are ordered by ``(key, id)``; ``key`` defaults to ``created_at``
+    and must be non-nullable for the keyset comparison to hold. ``id_key``
+    stands in for ``model.id`` when the order comes from a joined table.
+    """
+    key = model.created_at if key is None else key
+    id_key = model.id if id_key is None else id_key
+    keyset = tuple_(key, id_key)
+    if page.after is not None:
+        value, id = page.after
+        after = tuple_(literal(_cursor_value(key, value), key.type), literal(id))
+        query = query.filter(
+            keyset < after if order == SortOrder.DESC else keyset > after
+        )
+    if order == SortOrder.DESC:
+        query = query.order_by(key.desc(), id_key.desc())
+    else:
+        query = query.order_by(key, id_key)
+    rows = query.limit(page.limit + 1).all()
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key.key), rows[-1].id)
+    return rows, next_cursor
+
+
+def set_next_page(request: Request, response: Response, next_cursor: Optional[str]):
+    """Advertise the next page via ``X-Next-Cursor`` and a ``Link`` header."""
+    if next_cursor is None:
+        return
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
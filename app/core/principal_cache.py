@@ -0,0 +1,127 @@
+"""In-process cache of verified principals keyed by access token."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.core.invalidation import InvalidationBus
+from app.database import DBSession
+from app.models.user import User
+
+# token -> (expires_at, user_id, column snapshot)
+_Entry = Tuple[float, int, Dict[str, Any]]
+
+
+class PrincipalCache:
+    """Bounded LRU of authenticated users with per-entry expiry.
+
+    Entries hold a snapshot of the user's columns rather than the ORM
+    instance itself, so a hit can be re-attached to the request's session
+    without issuing a SELECT. An entry never outlives the token's ``exp``.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.bus: Optional[InvalidationBus] = None
+
+    def attach(self, bus: InvalidationBus) -> None:
+        """Drop users on every worker when one of them invalidates."""
+        self.bus = bus
+        bus.subscribe("principal", self.evict_users, self.evict_all)
+
+    def get(self, token: str, db: DBSession) -> Optional[User]:
+        """Return the cached user for ``token`` attached to ``db``."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            values = dict(entry[2])
+        user = User(**values)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    def put(self, token: str, user: User, token_exp: Optional[float]) -> None:
+        """Cache ``user`` for ``token`` until the TTL or token expiry."""
+        if self.maxsize <= 0:
+            return
+        ttl = self.bus.ttl(self.ttl_seconds) if self.bus else self.ttl_seconds
+        expires_at = time.time() + ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        values = {
+            attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs
+        }
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (expires_at, int(user.id), values)
+            self._tokens_by_user.setdefault(int(user.id), set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token belonging to ``user_id``."""
+        self.evict_users([str(user_id)])
+        if self.bus is not None:
+            self.bus.publish("principal", [str(user_id)])
+
+    def evict_users(self, user_ids: List[str]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                for token in list(self._tokens_by_user.get(int(user_id), ())):
+                    self._remove(token)
+
+    def evict_all(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def clear(self) -> None:
+        self.evict_all()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters used to size the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def _remove(self, token: str) -> None:
+        _, user_id, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.principal_cache_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
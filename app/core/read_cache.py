@@ -0,0 +1,344 @@
+"""Read-through cache of serialized task and comment responses.
+
+Entries hold the response body and its ETag, so a hit is answered (or
+turned into a 304) without touching the database or re-serializing. The
+backend is ``local`` (a per-process LRU), ``redis`` (shared by every worker
+over the Redis protocol) or ``none``. Write handlers invalidate the keys
+they affect after committing; ``cache_ttl_seconds`` bounds how long
+anything they cannot reach stays stale. Handlers load misses from the
+primary, since a replica still behind that commit would store the old row.
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.etags import etag_matches, not_modified
+from app.core.invalidation import InvalidationBus
+from app.core.pagination import set_next_page
+
+logger = logging.getLogger(__name__)
+
+
+class CacheError(Exception):
+    """The cache backend failed or replied with an error."""
+
+
+class LocalCache:
+    """Bounded in-process LRU with per-entry expiry."""
+
+    blocking = False
+    shared = False
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache:
+    """Minimal Redis protocol (RESP2) client speaking GET, SET PX and DEL.
+
+    Each thread keeps its own connection, opened on first use and dropped
+    on any socket error so the next call reconnects.
+    """
+
+    blocking = True
+    shared = True
+
+    def __init__(self, url: str, timeout_seconds: float = 1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout_seconds = timeout_seconds
+        self._local = threading.local()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._call("GET", key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._call("SET", key, value, "PX", str(max(int(ttl_seconds * 1000), 1)))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self._call("DEL", *keys)
+
+    def clear(self) -> None:
+        self._call("FLUSHDB")
+
+    def _call(self, *args):
+        conn = getattr(self._local, "conn", None)
+        try:
+            if conn is None:
+                conn = self._local.conn = self._connect()
+            return self._command(conn, *args)
+        except OSError as e:
+            self._local.conn = None
+            if conn is not None:
+                conn[0].close()
+            raise CacheError(f"Redis connection failed: {e}") from e
+
+    def _connect(self):
+        sock = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout_seconds
+        )
+        conn = (sock, sock.makefile("rb"))
+        if self.password:
+            self._command(conn, "AUTH", self.password)
+        if self.db:
+            self._command(conn, "SELECT", str(self.db))
+        return conn
+
+    @classmethod
+    def _command(cls, conn, *args):
+        sock, reader = conn
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        sock.sendall(b"".join(out))
+        return cls._reply(reader)
+
+    @classmethod
+    def _reply(cls, reader):
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by Redis")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise CacheError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = reader.read(size + 2)
+            if len(data) != size + 2:
+                raise ConnectionError("Connection closed by Redis")
+            return data[:-2]
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [cls._reply(reader) for _ in range(size)]
+        raise CacheError(f"Unexpected Redis reply {line!r}")
+
+
+@dataclass
+class CachedResponse:
+    """A serialized response body with the headers that depend on it."""
+
+    body: bytes
+    etag: str
+    next_cursor: Optional[str] = None
+
+    def encode(self) -> bytes:
+        head = json.dumps([self.etag, self.next_cursor]).encode()
+        return head + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedResponse":
+        head, body = raw.split(b"\n", 1)
+        etag, next_cursor = json.loads(head)
+        return cls(body, etag, next_cursor)
+
+
+Loader = Callable[[], Awaitable[Optional[CachedResponse]]]
+
+
+class ReadThroughCache:
+    """Read-through front for a backend with single-flight loading.
+
+    Concurrent misses for one key in a process share a single load; if it
+    fails or its caller is cancelled, the others load for themselves. A load
+    that overlaps an invalidation of its key is returned but not stored,
+    so it cannot overwrite a newer write. Backend failures count as misses.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._flights: Dict[str, "asyncio.Future[Optional[CachedResponse]]"] = {}
+        self._stale: Set[str] = set()
+        self.bus: Optional[InvalidationBus] = None
+
+    def attach(self, bus: InvalidationBus) -> None:
+        """Share invalidations of a per-process backend with other workers."""
+        if self.backend is None or self.backend.shared:
+            return
+        self.bus = bus
+        bus.subscribe("read", self.evict_local, self.reset_local)
+
+    async def get_or_load(self, key: str, load: Loader) -> Optional[CachedResponse]:
+        """The cached response for ``key``, calling ``load`` on a miss.
+
+        ``load`` returns None when there is nothing to serve; that is not
+        cached.
+        """
+        if self.backend is None:
+            return await load()
+        raw = await self._backend_call("get", key)
+        if raw is not None:
+            self.hits += 1
+            return CachedResponse.decode(raw)
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                # The leader's cancellation reaches followers through the
+                # flight; only a follower cancelled itself stops here
+                task = asyncio.current_task()
+                if task is not None and task.cancelling():
+                    raise
+                return await load()
+            except Exception:
+                return await load()
+        self.misses += 1
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        try:
+            value = await load()
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # followers retry; nothing else awaits it
+            raise
+        finally:
+            del self._flights[key]
+            stale = key in self._stale
+            self._stale.discard(key)
+        flight.set_result(value)
+        if value is not None and not stale:
+            ttl = self.bus.ttl(self.ttl_seconds) if self.bus else self.ttl_seconds
+            await self._backend_call("set", key, value.encode(), ttl)
+        return value
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop ``keys`` and keep loads already in flight from storing them."""
+        if self.backend is None:
+            return
+        self._stale.update(key for key in keys if key in self._flights)
+        await self._backend_call("delete", *keys)
+        if self.bus is not None:
+            self.bus.publish("read", keys)
+
+    def evict_local(self, keys: List[str]) -> None:
+        """Apply another worker's invalidation of ``keys``."""
+        self._stale.update(key for key in keys if key in self._flights)
+        self.backend.delete(*keys)
+
+    def reset_local(self) -> None:
+        self._stale.update(self._flights)
+        self.backend.clear()
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+        self.hits = self.misses = self.coalesced = self.errors = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
+
+    async def _backend_call(self, method: str, *args):
+        fn = getattr(self.backend, method)
+        try:
+            if self.backend.blocking:
+                return await run_in_threadpool(fn, *args)
+            return fn(*args)
+        except CacheError:
+            self.errors += 1
+            logger.warning("Cache %s failed", method, exc_info=True)
+            return None
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Serve ``entry`` as-is, or a 304 if the client already has it."""
+    if etag_matches(request, entry.etag):
+        return not_modified(entry.etag)
+    response = Response(
+        entry.body, media_type="application/json", headers={"ETag": entry.etag}
+    )
+    set_next_page(request, response, entry.next_cursor)
+    return response
+
+
+def task_key(task_id: int) -> str:
+    return f"task:{task_id}"
+
+
+def comments_key(task_id: int) -> str:
+    """The first, default-sized page of a task's comments."""
+    return f"task:{task_id}:comments"
+
+
+def task_keys(*task_ids: int) -> List[str]:
+    """Every key derived from the given tasks."""
+    return [key for id in task_ids for key in (task_key(id), comments_key(id))]
+
+
+def build_backend(name: str):
+    if name == "local":
+        return LocalCache(settings.cache_size)
+    if name == "redis":
+        return RedisCache(settings.cache_url, settings.cache_timeout_seconds)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown cache backend {name!r}")
+
+
+read_cache = ReadThroughCache(
+    build_backend(settings.cache_backend), settings.cache_ttl_seconds
+)
@@ -1,5 +1,9 @@
 """Security utilities: password hashing and JWT handling."""
 
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -19,6 +23,59 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full."""
+
+
+# bcrypt is CPU bound and holds the GIL, so it runs in its own processes.
+# The semaphore bounds running + queued jobs; beyond that callers are
+# rejected instead of piling up behind a login storm.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(
+    settings.password_hash_workers + settings.password_hash_queue_depth
+)
+
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _hash_executor
+
+
+async def _run_in_hash_executor(fn, *args):
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        future = _get_hash_executor().submit(fn, *args)
+    except BaseException:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_executor(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_executor(get_password_hash, password)
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(wait=True, cancel_futures=True)
+            _hash_executor = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
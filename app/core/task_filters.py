@@ -0,0 +1,90 @@
+"""Filters and sort keys for task lists, each backed by an index."""
+
+import operator
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Query
+from sqlalchemy import select
+
+from app.models.task import Task, TaskAssignment, TaskPriority, TaskStatus
+from app.schemas.task import TaskSort
+
+# (parameter, column, comparison); every column leads an index on tasks
+COLUMN_FILTERS: List[Tuple[str, Any, Callable[[Any, Any], Any]]] = [
+    ("status", Task.status, operator.eq),
+    ("priority", Task.priority, operator.eq),
+    ("creator_id", Task.creator_id, operator.eq),
+    ("created_after", Task.created_at, operator.gt),
+    ("created_before", Task.created_at, operator.lt),
+    ("completed_after", Task.completed_at, operator.gt),
+    ("completed_before", Task.completed_at, operator.lt),
+]
+
+# Sort keys are non-null; those on tasks' mutable counters are deliberately
+# unindexed so the counter updates stay HOT
+SORT_KEYS: Dict[TaskSort, Any] = {
+    TaskSort.CREATED_AT: Task.created_at,
+    TaskSort.UPDATED_AT: Task.modified_at,
+    TaskSort.PRIORITY: Task.priority,
+    TaskSort.LAST_ACTIVITY_AT: Task.last_activity_at,
+    TaskSort.COMMENT_COUNT: Task.comment_count,
+    TaskSort.ASSIGNEE_COUNT: Task.assignee_count,
+}
+
+
+def _assigned_to(user_id: int) -> Any:
+    # Probes ix_task_assignments_assigned_user_id_task_id
+    return (
+        select(TaskAssignment.id)
+        .where(
+            TaskAssignment.task_id == Task.id,
+            TaskAssignment.assigned_user_id == user_id,
+        )
+        .exists()
+    )
+
+
+class TaskFilters:
+    """Query parameters shared by the task list and export endpoints.
+
+    ``assigned`` is relative to the caller: true for tasks assigned to
+    them, false for tasks they created.
+    """
+
+    def __init__(
+        self,
+        status: Optional[TaskStatus] = Query(None),
+        priority: Optional[TaskPriority] = Query(None),
+        creator_id: Optional[int] = Query(None),
+        assignee_id: Optional[int] = Query(None),
+        assigned: Optional[bool] = Query(None),
+        created_after: Optional[datetime] = Query(None),
+        created_before: Optional[datetime] = Query(None),
+        completed_after: Optional[datetime] = Query(None),
+        completed_before: Optional[datetime] = Query(None),
+    ):
+        self.status = status
+        self.priority = priority
+        self.creator_id = creator_id
+        self.assignee_id = assignee_id
+        self.assigned = assigned
+        self.created_after = created_after
+        self.created_before = created_before
+        self.completed_after = completed_after
+        self.completed_before = completed_before
+
+    def clauses(self, user_id: int) -> List[Any]:
+        """WHERE clauses for the filters that were given."""
+        clauses = [
+            compare(column, getattr(self, name))
+            for name, column, compare in COLUMN_FILTERS
+            if getattr(self, name) is not None
+        ]
+        if self.assignee_id is not None:
+            clauses.append(_assigned_to(self.assignee_id))
+        if self.assigned is True:
+            clauses.append(_assigned_to(user_id))
+        elif self.assigned is False:
+            clauses.append(Task.creator_id == user_id)
+        return clauses
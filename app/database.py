@@ -1,19 +1,177 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+import itertools
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from fastapi import Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
+from app.core.metrics import instrumented_pool_class
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Either session flavour; handlers pass it to run_db without caring which
+DBSession = Union[Session, AsyncSession]
+
+
+def _pool_options(name: str, pool_class: type) -> dict:
+    """Engine keyword arguments for the configured connection pool."""
+    return {
+        "poolclass": instrumented_pool_class(name, pool_class),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def _connect_args(asyncpg: bool = False) -> dict:
+    """Per-connection statement_timeout, sent as a startup parameter."""
+    if not settings.db_statement_timeout_ms:
+        return {}
+    timeout = str(settings.db_statement_timeout_ms)
+    if asyncpg:
+        return {"server_settings": {"statement_timeout": timeout}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
 
 # Create database engine
-engine = create_engine(settings.get_database_url)
+engine = create_engine(
+    settings.get_database_url,
+    connect_args=_connect_args(),
+    **_pool_options("primary", QueuePool),
+)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg); objects must stay readable after commit because
+# lazy loads are not allowed outside the greenlet bridge
+async_engine = create_async_engine(
+    settings.get_async_database_url,
+    connect_args=_connect_args(asyncpg=True),
+    **_pool_options("primary_async", AsyncAdaptedQueuePool),
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
 # Create base class for models
 Base = declarative_base()
 
+# Clients that wrote within the read-your-writes window send this back
+LAST_WRITE_COOKIE = "last_write_at"
+LAST_WRITE_HEADER = "X-Last-Write-At"
+
+
+class Replica:
+    """One read replica with sync and async engines."""
+
+    def __init__(self, index: int, url: str):
+        self.url = url
+        self.healthy = True
+        self.engine: Engine = create_engine(
+            url,
+            connect_args=_connect_args(),
+            **_pool_options(f"replica{index}", QueuePool),
+        )
+        self.async_engine: AsyncEngine = create_async_engine(
+            url.replace("postgresql://", "postgresql+asyncpg://", 1),
+            connect_args=_connect_args(asyncpg=True),
+            **_pool_options(f"replica{index}_async", AsyncAdaptedQueuePool),
+        )
+
+
+class ReplicaSet:
+    """Round robin over the replicas that passed their last health check."""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(i, url) for i, url in enumerate(urls)]
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def pick(self) -> Optional[Replica]:
+        """Next healthy replica, or None to fall back to the primary."""
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            index = next(self._counter)
+        return healthy[index % len(healthy)]
+
+    def check(self) -> None:
+        """Ping every replica and update its health flag."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception:
+                if replica.healthy:
+                    logger.warning("Replica %s failed health check", replica.url)
+                replica.healthy = False
+            else:
+                replica.healthy = True
+
+
+replicas = ReplicaSet(settings.database_replica_urls)
+
+
+def recently_wrote(request: Request) -> bool:
+    """Whether the client wrote within the read-your-writes window."""
+    value = request.cookies.get(LAST_WRITE_COOKIE) or request.headers.get(
+        LAST_WRITE_HEADER
+    )
+    if not value:
+        return False
+    try:
+        last_write_at = float(value)
+    except ValueError:
+        return False
+    return time.time() - last_write_at < settings.read_your_writes_seconds
+
+
+def mark_write(request: Request) -> None:
+    """Route dependency for handlers that write.
+
+    Successful responses to them carry the last-write marker, pinning the
+    client's reads to the primary for ``read_your_writes_seconds``.
+    """
+    request.state.wrote = True
+
+
+def _read_replica(request: Request) -> Optional[Replica]:
+    if recently_wrote(request):
+        return None
+    return replicas.pick()
+
 
 def get_db():
     """Get database session."""
@@ -22,3 +180,67 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Get async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_read_db(request: Request):
+    """Get database session for read-only handlers, on a replica if safe."""
+    replica = _read_replica(request)
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Get async database session for read-only handlers."""
+    replica = _read_replica(request)
+    bind = replica.async_engine if replica else async_engine
+    async with AsyncSessionLocal(bind=bind) as db:
+        yield db
+
+
+# Session dependencies used by the routers, selected by settings.use_async_db
+get_session = get_async_db if settings.use_async_db else get_db
+get_read_session = get_async_read_db if settings.use_async_db else get_read_db
+
+
+async def run_db(db: DBSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(session, *args, **kwargs)`` without blocking the event loop.
+
+    Sync sessions run it in the threadpool. Async sessions run it through
+    ``AsyncSession.run_sync``, so DB waits are awaited on asyncpg instead of
+    holding a thread.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def _next_batch(partitions: Iterator[Sequence[Row]]) -> Optional[Sequence[Row]]:
+    return next(partitions, None)
+
+
+async def stream_db(
+    db: DBSession, stmt: Select, batch_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield the rows of ``stmt`` in batches from a server-side cursor."""
+    stmt = stmt.execution_options(yield_per=batch_size)
+    if isinstance(db, AsyncSession):
+        async_result = await db.stream(stmt)
+        async for partition in async_result.partitions():
+            yield partition
+        return
+    result = await run_in_threadpool(db.execute, stmt)
+    partitions = result.partitions()
+    while True:
+        batch = await run_in_threadpool(_next_batch, partitions)
+        if batch is None:
+            break
+        yield batch
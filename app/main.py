@@ -1,10 +1,21 @@
 """Main FastAPI application entry point."""
 
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.api import auth, comment, task, user
+from app.api import auth, comment, job, metrics, task, user
 from app.config import settings
+from app.core import security
+from app.core.invalidation import bus
+from app.core.principal_cache import principal_cache
+from app.core.read_cache import read_cache
+from app.database import LAST_WRITE_COOKIE, LAST_WRITE_HEADER, replicas
 
 
 def custom_openapi():
@@ -104,6 +115,30 @@ def custom_openapi():
     return app.openapi_schema
 
 
+async def check_replicas_periodically():
+    """Keep replica health flags current for read routing."""
+    while True:
+        await run_in_threadpool(replicas.check)
+        await asyncio.sleep(settings.replica_health_check_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop process-wide resources."""
+    tasks = []
+    if replicas.replicas:
+        tasks.append(asyncio.create_task(check_replicas_periodically()))
+    if settings.cache_invalidation_enabled:
+        principal_cache.attach(bus)
+        read_cache.attach(bus)
+        bus.start(asyncio.get_running_loop())
+    yield
+    for background_task in tasks:
+        background_task.cancel()
+    bus.stop()
+    security.shutdown_hash_executor()
+
+
 app = FastAPI(
     title=settings.title,
     description=settings.description,
@@ -111,16 +146,48 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 # Set custom OpenAPI schema
 app.openapi = custom_openapi  # type: ignore
 
+
+@app.middleware("http")
+async def mark_recent_writes(request: Request, call_next):
+    """Pin the client's reads to the primary for a while after a write."""
+    response = await call_next(request)
+    if getattr(request.state, "wrote", False) and response.status_code < 400:
+        last_write_at = f"{time.time():.3f}"
+        response.headers[LAST_WRITE_HEADER] = last_write_at
+        response.set_cookie(
+            LAST_WRITE_COOKIE,
+            last_write_at,
+            max_age=settings.read_your_writes_seconds,
+            httponly=True,
+        )
+    return response
+
+
+@app.exception_handler(security.PasswordHasherBusy)
+async def password_hasher_busy_handler(
+    request: Request, exc: security.PasswordHasherBusy
+):
+    """Shed load when the password hashing queue is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please retry later"},
+        headers={"Retry-After": str(settings.password_hash_retry_after_seconds)},
+    )
+
+
 # Routers
 app.include_router(auth.router)
 app.include_router(user.router)
 app.include_router(task.router)
 app.include_router(comment.router)
+app.include_router(job.router)
+app.include_router(metrics.router)
 
 
 # Health check
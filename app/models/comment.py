@@ -1,24 +1,59 @@
 """Comment model for task comments."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.search import SEARCH_CONFIG
 
 
 class Comment(Base):
     """Comment model."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_task_id_created_at", "task_id", "created_at"),
+        Index("ix_comments_author_id", "author_id"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
-    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    author_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Row version for ETags, as on Task
+    xmin = Column(
+        String,
+        system=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', content)", persisted=True),
+        deferred=True,
+    )
+
     # Relationships
     task = relationship("Task", back_populates="comments")
     author = relationship("User", back_populates="comments")
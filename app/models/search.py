@@ -0,0 +1,58 @@
+"""Full-text and trigram search support shared by the models."""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import DDL, Column, event, literal_column, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnClause
+
+from app.database import Base
+
+# Text search configuration baked into the generated tsvector columns;
+# queries must use the same one for the GIN indexes to apply
+SEARCH_CONFIG = "english"
+search_config: ColumnClause[Any] = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+def result_columns(model: Any) -> List[Column]:
+    """``model``'s columns minus search vectors, for RETURNING and projections."""
+    return [c for c in model.__table__.columns if not isinstance(c.type, TSVECTOR)]
+
+
+def pg_trgm_available(ddl: Any, target: Any, bind: Any, *args: Any, **kw: Any) -> bool:
+    """Whether the server ships pg_trgm (part of the standard contrib set)."""
+    return (
+        bind.execute(
+            text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).first()
+        is not None
+    )
+
+
+_pg_trgm_installed: Dict[Engine, bool] = {}
+
+
+def pg_trgm_installed(db: Session) -> bool:
+    """Whether pg_trgm is installed in ``db``'s database, checked once per engine."""
+    engine = db.get_bind().engine
+    if engine not in _pg_trgm_installed:
+        _pg_trgm_installed[engine] = (
+            db.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first()
+            is not None
+        )
+    return _pg_trgm_installed[engine]
+
+
+# Mirrors the migration for metadata.create_all; servers without contrib
+# simply go without the trigram index
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(
+        callable_=pg_trgm_available
+    ),
+)
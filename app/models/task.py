@@ -1,12 +1,27 @@
 """Task model for task management."""
 
 import enum
-
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    Computed,
+    DateTime,
+    Enum,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
+from app.models.search import SEARCH_CONFIG, pg_trgm_available
 
 
 class TaskStatus(str, enum.Enum):
@@ -31,6 +46,27 @@ class Task(Base):
     """Task model."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_creator_id_status", "creator_id", "status"),
+        Index("ix_tasks_status", "status"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_priority_id", "priority", "id"),
+        Index(
+            "ix_tasks_modified_at_id", text("coalesce(updated_at, created_at)"), "id"
+        ),
+        Index(
+            "ix_tasks_completed_at",
+            "completed_at",
+            postgresql_where=text("completed_at IS NOT NULL"),
+        ),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(callable_=pg_trgm_available),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -41,20 +77,66 @@ class Task(Base):
     priority: Mapped[TaskPriority] = mapped_column(
         Enum(TaskPriority), default=TaskPriority.MEDIUM
     )
-    creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    creator_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Postgres stamps every new row version with the writing transaction's
+    # id, so xmin changes on each write; ETags are derived from it
+    xmin = Column(
+        String,
+        system=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+    # Never-updated tasks count as modified when created; keeps the sort
+    # key non-null for keyset pagination (see ix_tasks_modified_at_id)
+    modified_at: Mapped[datetime] = column_property(
+        func.coalesce(updated_at, created_at)
+    )
+
+    # Denormalized for list views; kept in step by the comment and
+    # assignment writes in the same transaction
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    assignee_count = Column(Integer, nullable=False, default=0, server_default="0")
+    last_activity_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    # Title outranks description; deferred so ordinary loads skip it
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')"
+            f" || setweight(to_tsvector('{SEARCH_CONFIG}', "
+            "coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     # Relationships
     creator = relationship(
         "User", back_populates="created_tasks", foreign_keys=[creator_id]
     )
+    # Children are removed by ON DELETE CASCADE, not loaded and deleted here
     assignments = relationship(
-        "TaskAssignment", back_populates="task", cascade="all, delete-orphan"
+        "TaskAssignment",
+        back_populates="task",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="TaskAssignment.id",
     )
     comments = relationship(
-        "Comment", back_populates="task", cascade="all, delete-orphan"
+        "Comment",
+        back_populates="task",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="(Comment.created_at, Comment.id)",
     )
 
 
@@ -62,13 +144,41 @@ class TaskAssignment(Base):
     """Task assignment model."""
 
     __tablename__ = "task_assignments"
+    __table_args__ = (
+        Index(
+            "ix_task_assignments_task_id_assigned_user_id",
+            "task_id",
+            "assigned_user_id",
+            unique=True,
+        ),
+        Index(
+            "ix_task_assignments_assigned_user_id_task_id",
+            "assigned_user_id",
+            "task_id",
+        ),
+        Index("ix_task_assignments_assigned_by_id", "assigned_by_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
-    assigned_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    assigned_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    assigned_user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    assigned_by_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
     assigned_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Row version for ETags, as on Task
+    xmin = Column(
+        String,
+        system=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
     # Relationships
     task = relationship("Task", back_populates="assignments")
     assigned_user = relationship(
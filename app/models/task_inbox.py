@@ -0,0 +1,98 @@
+"""Per-user fan-out of the tasks behind ``GET /tasks/inbox``."""
+
+from sqlalchemy import DDL, Column, DateTime, ForeignKey, Index, Integer, event
+
+from app.database import Base
+
+# One row per task a user created or is assigned, carrying a copy of the
+# task's last_activity_at so a user's inbox is read newest-first straight
+# off ix_task_inbox_user_id_activity. Triggers fan writes out; removing a
+# task or user cascades through the foreign keys.
+FUNCTION_DDL = """
+CREATE OR REPLACE FUNCTION task_inbox_add_creator() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_inbox (user_id, task_id, last_activity_at)
+    VALUES (NEW.creator_id, NEW.id, NEW.last_activity_at)
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION task_inbox_touch() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE task_inbox SET last_activity_at = NEW.last_activity_at
+    WHERE task_id = NEW.id;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION task_inbox_add_assignee() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_inbox (user_id, task_id, last_activity_at)
+    SELECT NEW.assigned_user_id, tasks.id, tasks.last_activity_at
+    FROM tasks WHERE tasks.id = NEW.task_id
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION task_inbox_remove_assignee() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM task_inbox USING tasks
+    WHERE task_inbox.user_id = OLD.assigned_user_id
+        AND task_inbox.task_id = OLD.task_id
+        AND tasks.id = OLD.task_id
+        AND tasks.creator_id <> OLD.assigned_user_id;
+    RETURN NULL;
+END
+$$;
+"""
+
+TRIGGER_DDL = """
+CREATE OR REPLACE TRIGGER task_inbox_add_creator
+AFTER INSERT ON tasks
+FOR EACH ROW EXECUTE FUNCTION task_inbox_add_creator();
+
+CREATE OR REPLACE TRIGGER task_inbox_touch
+AFTER UPDATE OF last_activity_at ON tasks
+FOR EACH ROW
+WHEN (OLD.last_activity_at IS DISTINCT FROM NEW.last_activity_at)
+EXECUTE FUNCTION task_inbox_touch();
+
+CREATE OR REPLACE TRIGGER task_inbox_add_assignee
+AFTER INSERT ON task_assignments
+FOR EACH ROW EXECUTE FUNCTION task_inbox_add_assignee();
+
+CREATE OR REPLACE TRIGGER task_inbox_remove_assignee
+AFTER DELETE ON task_assignments
+FOR EACH ROW EXECUTE FUNCTION task_inbox_remove_assignee();
+"""
+
+
+class TaskInbox(Base):
+    """A task in a user's inbox, created by or assigned to them."""
+
+    __tablename__ = "task_inbox"
+    __table_args__ = (
+        Index(
+            "ix_task_inbox_user_id_activity", "user_id", "last_activity_at", "task_id"
+        ),
+        Index("ix_task_inbox_task_id", "task_id"),
+    )
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_activity_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# Mirrors the migration for metadata.create_all, once all tables exist
+event.listen(Base.metadata, "after_create", DDL(FUNCTION_DDL))
+event.listen(Base.metadata, "after_create", DDL(TRIGGER_DDL))
@@ -0,0 +1,103 @@
+"""Incrementally maintained task aggregates behind ``GET /tasks/stats``."""
+
+from sqlalchemy import DDL, Column, Enum, ForeignKey, Integer, SmallInteger, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.task import TaskPriority, TaskStatus
+
+# Completion latency is histogrammed in power-of-two buckets of seconds:
+# bucket b holds tasks completed in [2**b, 2**(b + 1)) seconds (bucket 0
+# also takes anything under a second); NOT_COMPLETED holds the rest
+NOT_COMPLETED = -1
+
+# Kept in step by row triggers on tasks, so every write path (including
+# bulk inserts and cascaded deletes) is counted without extra round trips.
+# Tasks with a NULL status or priority are left uncounted.
+FUNCTION_DDL = f"""
+CREATE OR REPLACE FUNCTION task_stats_bucket(
+    status taskstatus, created_at timestamptz, completed_at timestamptz
+) RETURNS smallint LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN status <> 'COMPLETED' OR completed_at IS NULL
+            OR created_at IS NULL THEN {NOT_COMPLETED}
+        ELSE floor(log(2, greatest(
+            extract(epoch FROM completed_at - created_at), 1
+        )::numeric))::smallint
+    END
+$$;
+
+CREATE OR REPLACE FUNCTION task_stats_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE')
+            AND OLD.status IS NOT NULL AND OLD.priority IS NOT NULL THEN
+        UPDATE task_stats SET task_count = task_count - 1
+        WHERE creator_id = OLD.creator_id
+            AND status = OLD.status
+            AND priority = OLD.priority
+            AND completion_bucket = task_stats_bucket(
+                OLD.status, OLD.created_at, OLD.completed_at
+            );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE')
+            AND NEW.status IS NOT NULL AND NEW.priority IS NOT NULL THEN
+        INSERT INTO task_stats AS s (
+            creator_id, status, priority, completion_bucket, task_count
+        )
+        VALUES (
+            NEW.creator_id,
+            NEW.status,
+            NEW.priority,
+            task_stats_bucket(NEW.status, NEW.created_at, NEW.completed_at),
+            1
+        )
+        ON CONFLICT (creator_id, status, priority, completion_bucket)
+        DO UPDATE SET task_count = s.task_count + 1;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+TRIGGER_DDL = """
+CREATE OR REPLACE TRIGGER task_stats_insert_delete
+AFTER INSERT OR DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION task_stats_apply();
+
+CREATE OR REPLACE TRIGGER task_stats_update
+AFTER UPDATE OF creator_id, status, priority, created_at, completed_at ON tasks
+FOR EACH ROW
+WHEN (
+    (OLD.creator_id, OLD.status, OLD.priority, OLD.created_at, OLD.completed_at)
+    IS DISTINCT FROM
+    (NEW.creator_id, NEW.status, NEW.priority, NEW.created_at, NEW.completed_at)
+)
+EXECUTE FUNCTION task_stats_apply();
+"""
+
+
+class TaskStats(Base):
+    """Number of tasks per creator, status, priority and latency bucket."""
+
+    __tablename__ = "task_stats"
+
+    creator_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    status: Mapped[TaskStatus] = mapped_column(Enum(TaskStatus), primary_key=True)
+    priority: Mapped[TaskPriority] = mapped_column(Enum(TaskPriority), primary_key=True)
+    completion_bucket = Column(SmallInteger, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+
+
+DROP_DDL = """
+DROP FUNCTION IF EXISTS task_stats_apply() CASCADE;
+DROP FUNCTION IF EXISTS task_stats_bucket(taskstatus, timestamptz, timestamptz);
+"""
+
+# Mirrors the migration for metadata.create_all, once both tables exist;
+# the functions go first on drop_all since they depend on the enum types
+event.listen(Base.metadata, "after_create", DDL(FUNCTION_DDL))
+event.listen(Base.metadata, "after_create", DDL(TRIGGER_DDL))
+event.listen(Base.metadata, "before_drop", DDL(DROP_DDL))
@@ -1,6 +1,6 @@
 """User model for authentication and user management."""
 
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, FetchedValue, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -11,6 +11,7 @@ class User(Base):
     """User model."""
 
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -21,13 +22,25 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    # Relationships
+    # Row version for ETags, as on Task
+    xmin = Column(
+        String,
+        system=True,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+    )
+
+    # Relationships; deleting a user cascades in the database
     created_tasks = relationship(
-        "Task", back_populates="creator", foreign_keys="Task.creator_id"
+        "Task",
+        back_populates="creator",
+        foreign_keys="Task.creator_id",
+        passive_deletes=True,
     )
     assigned_tasks = relationship(
         "TaskAssignment",
         back_populates="assigned_user",
         foreign_keys="TaskAssignment.assigned_user_id",
+        passive_deletes=True,
     )
-    comments = relationship("Comment", back_populates="author")
+    comments = relationship("Comment", back_populates="author", passive_deletes=True)
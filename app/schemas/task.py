@@ -1,11 +1,34 @@
 """Task-related Pydantic schemas."""
 
+import enum
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
 from app.models.task import TaskPriority, TaskStatus
+from app.schemas.comment import Comment
+from app.schemas.user import UserSummary
+
+
+class TaskInclude(str, enum.Enum):
+    """Related resources that task reads can embed via ``?include=``."""
+
+    ASSIGNMENTS = "assignments"
+    COMMENTS = "comments"
+    CREATOR = "creator"
+    ASSIGNEES = "assignees"
+
+
+class TaskSort(str, enum.Enum):
+    """Sort keys accepted by the task list."""
+
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+    PRIORITY = "priority"
+    LAST_ACTIVITY_AT = "last_activity_at"
+    COMMENT_COUNT = "comment_count"
+    ASSIGNEE_COUNT = "assignee_count"
 
 
 class TaskBase(BaseModel):
@@ -40,6 +63,9 @@ class TaskInDB(TaskBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    comment_count: int = 0
+    assignee_count: int = 0
+    last_activity_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -48,6 +74,74 @@ class Task(TaskInDB):
     """Schema for task response."""
 
 
+class TaskSearchResult(Task):
+    """Schema for a full-text search hit."""
+
+    rank: float
+
+
+class TaskSuggestion(BaseModel):
+    """Schema for a title autocomplete suggestion."""
+
+    id: int
+    title: str
+
+
+class TaskStatsScope(str, enum.Enum):
+    """Whose tasks ``GET /tasks/stats`` aggregates."""
+
+    MINE = "mine"
+    ALL = "all"
+
+
+class TaskCompletionLatency(BaseModel):
+    """Seconds from creation to completion at a few percentiles.
+
+    Each value is the upper bound of the power-of-two bucket holding that
+    percentile, so it overstates the true latency by at most 2x.
+    """
+
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
+
+class TaskStats(BaseModel):
+    """Schema for task statistics."""
+
+    total: int
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[TaskPriority, int]
+    completion_rate: float
+    completion_latency_seconds: TaskCompletionLatency
+
+
+class TaskBulkCreate(BaseModel):
+    """Schema for creating many tasks at once.
+
+    Items are validated individually against ``TaskCreate``. With ``atomic``
+    any invalid item rejects the whole batch; otherwise valid items are
+    created and the invalid ones reported.
+    """
+
+    tasks: List[Dict[str, Any]]
+    atomic: bool = True
+
+
+class TaskBulkError(BaseModel):
+    """Validation errors for one item of a bulk request."""
+
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class TaskBulkResult(BaseModel):
+    """Schema for bulk task creation response."""
+
+    created: List[Task]
+    errors: List[TaskBulkError] = []
+
+
 class TaskAssignmentBase(BaseModel):
     """Base task assignment schema."""
 
@@ -73,3 +167,30 @@ class TaskAssignmentInDB(TaskAssignmentBase):
 
 class TaskAssignment(TaskAssignmentInDB):
     """Schema for task assignment response."""
+
+
+class TaskExpanded(Task):
+    """Schema for a task with the related resources asked for in ``include``.
+
+    Resources that were not requested are left unset and omitted from the
+    response rather than rendered as null.
+    """
+
+    assignments: Optional[List[TaskAssignment]] = None
+    comments: Optional[List[Comment]] = None
+    creator: Optional[UserSummary] = None
+    assignees: Optional[List[UserSummary]] = None
+
+
+class TaskAssignmentBulkCreate(BaseModel):
+    """Schema for assigning many users to a task."""
+
+    assigned_user_ids: List[int]
+
+
+class TaskAssignmentBulkResult(BaseModel):
+    """Schema for bulk assignment response."""
+
+    created: List[TaskAssignment]
+    already_assigned: List[int] = []
+    not_found: List[int] = []
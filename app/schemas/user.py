@@ -45,6 +45,15 @@ class User(UserInDB):
     pass
 
 
+class UserSummary(BaseModel):
+    """Public view of a user embedded in other resources."""
+
+    id: int
+    username: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UserLogin(BaseModel):
     """Schema for user login."""
 
@@ -5,11 +5,13 @@ import os
 import pytest
 from dotenv import load_dotenv
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
+from app.core.principal_cache import principal_cache
+from app.core.read_cache import read_cache
 from app.core.security import create_access_token
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 from app.main import app
 from app.models.comment import Comment
 from app.models.task import Task, TaskPriority, TaskStatus
@@ -52,6 +54,23 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: timing comparison, skipped unless RUN_BENCHMARKS=1"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip wall-clock benchmarks unless asked for; they are load sensitive."""
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -71,6 +90,8 @@ def db():
         yield db
     finally:
         db.close()
+        principal_cache.clear()
+        read_cache.clear()
         Base.metadata.drop_all(bind=engine)
         Base.metadata.create_all(bind=engine)
 
@@ -173,3 +194,16 @@ def test_comment(db, test_user, test_task):
     db.commit()
     db.refresh(comment)
     return comment
+
+
+@pytest.fixture
+def statements():
+    """Record every statement sent through the test engine."""
+    recorded = []
+
+    def record(conn, cursor, statement, *args):
+        recorded.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", record)
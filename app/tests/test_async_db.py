@@ -0,0 +1,101 @@
+"""Tests for the routers running on the asyncpg session."""
+
+import pytest
+from fastapi import status
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.database import get_db, get_read_db
+from app.main import app
+from app.tests.conftest import SQLALCHEMY_DATABASE_URL, override_get_db
+
+# NullPool: TestClient runs every request on a fresh event loop
+async_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    poolclass=NullPool,
+)
+AsyncTestingSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+async def override_get_async_db():
+    async with AsyncTestingSessionLocal() as db:
+        yield db
+
+
+@pytest.fixture
+def async_db():
+    """Serve requests through AsyncSession for the duration of a test."""
+    app.dependency_overrides[get_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_async_db
+    yield
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+
+class TestAsyncDatabase:
+    """Test endpoints end to end on the async session."""
+
+    def test_register_and_login(self, client, db, async_db):
+        """Test registration and login on the async session."""
+        response = client.post(
+            "/auth/register",
+            json={
+                "email": "async@example.com",
+                "username": "asyncuser",
+                "password": "asyncpassword",
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        response = client.post(
+            "/auth/login",
+            data={"username": "async@example.com", "password": "asyncpassword"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_task_lifecycle(self, client, auth_headers, test_user2, async_db):
+        """Test creating, assigning, commenting and completing a task."""
+        response = client.post(
+            "/tasks/", headers=auth_headers, json={"title": "Async Task"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        task_id = response.json()["id"]
+
+        response = client.post(
+            f"/tasks/{task_id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.post(
+            f"/comments/task/{task_id}",
+            headers=auth_headers,
+            json={"content": "Async comment"},
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.get(f"/comments/task/{task_id}", headers=auth_headers)
+        assert [c["content"] for c in response.json()] == ["Async comment"]
+
+        response = client.post(f"/tasks/{task_id}/complete", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "completed"
+
+        response = client.get("/tasks/?status=completed", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == [task_id]
+
+    def test_update_me(self, client, auth_headers, async_db):
+        """Test updating the current user on the async session."""
+        response = client.put(
+            "/users/me", headers=auth_headers, json={"username": "asyncrenamed"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["username"] == "asyncrenamed"
+
+    def test_export_tasks(self, client, auth_headers, test_task, async_db):
+        """Test streaming export through AsyncSession.stream."""
+        response = client.get("/tasks/export?format=csv", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.text.splitlines()) == 2
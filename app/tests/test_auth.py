@@ -87,3 +87,40 @@ class TestAuth:
         """Test getting current user without token."""
         response = client.get("/auth/me")
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_get_current_user_cached(self, client, auth_headers):
+        """Test repeated requests with one token are served from the cache."""
+        from app.core.principal_cache import principal_cache
+
+        principal_cache.clear()
+        client.get("/auth/me", headers=auth_headers)
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["email"] == "test@example.com"
+        stats = principal_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_cached_principal_invalidated_on_update(self, client, auth_headers):
+        """Test changing the email drops the cached principal for old tokens."""
+        client.get("/auth/me", headers=auth_headers)
+        client.put(
+            "/users/me", headers=auth_headers, json={"email": "moved@example.com"}
+        )
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_hasher_saturated(self, client, test_user, monkeypatch):
+        """Test login is shed with 503 when the hashing queue is full."""
+        import threading
+
+        from app.core import security
+
+        monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+        security._hash_slots.acquire()
+        response = client.post(
+            "/auth/login",
+            data={"username": test_user.email, "password": "testpassword"},
+        )
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
@@ -103,3 +103,76 @@ class TestComments:
         """Test deleting a non-existent comment."""
         response = client.delete("/comments/999", headers=auth_headers)
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_delete_comment_twice(self, client, db, auth_headers, test_task):
+        """Test racing deletes of one comment decrement the counter once."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from app.core import crud_comment
+        from app.models.task import Task
+        from app.tests.conftest import TestingSessionLocal
+
+        url = f"/comments/task/{test_task.id}"
+        for content in ("A", "B"):
+            comment = client.post(url, headers=auth_headers, json={"content": content})
+        comment_id, author_id = comment.json()["id"], comment.json()["author_id"]
+
+        def delete(_):
+            with TestingSessionLocal() as session:
+                return crud_comment.delete_comment(session, comment_id, author_id)
+
+        with ThreadPoolExecutor(2) as pool:
+            results = list(pool.map(delete, range(2)))
+        response = client.delete(f"/comments/{comment_id}", headers=auth_headers)
+
+        assert set(results) == {test_task.id, None}
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        db.expire_all()
+        assert db.get(Task, test_task.id).comment_count == 1
+
+    def test_get_comments_paginated(self, client, auth_headers, test_task):
+        """Test comment pages advertise the next page in a Link header."""
+        for i in range(3):
+            client.post(
+                f"/comments/task/{test_task.id}",
+                headers=auth_headers,
+                json={"content": f"Comment {i}"},
+            )
+        response = client.get(
+            f"/comments/task/{test_task.id}?limit=2", headers=auth_headers
+        )
+        assert [c["content"] for c in response.json()] == ["Comment 0", "Comment 1"]
+        assert 'rel="next"' in response.headers["Link"]
+
+        cursor = response.headers["X-Next-Cursor"]
+        response = client.get(
+            f"/comments/task/{test_task.id}?limit=2&cursor={cursor}",
+            headers=auth_headers,
+        )
+        assert [c["content"] for c in response.json()] == ["Comment 2"]
+        assert "Link" not in response.headers
+
+    def test_get_comments_etag(self, client, auth_headers, test_comment):
+        """Test conditional GETs of a comment page until a comment changes."""
+        url = f"/comments/task/{test_comment.task_id}"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        headers = {**auth_headers, "If-None-Match": etag}
+        response = client.get(url, headers=headers)
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        client.put(
+            f"/comments/{test_comment.id}",
+            headers=auth_headers,
+            json={"content": "Edited"},
+        )
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.json()[0]["content"] == "Edited"
+
+    def test_get_comments_etag_missing_task(self, client, auth_headers):
+        """Test a conditional GET still reports a missing task."""
+        response = client.get(
+            "/comments/task/9999", headers={**auth_headers, "If-None-Match": "*"}
+        )
+        assert response.status_code == 404
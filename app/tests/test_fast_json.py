@@ -0,0 +1,264 @@
+"""Tests and benchmark for the orjson list serialization path."""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+
+from app.api.task import TASK_ROWS
+from app.core import crud_task
+from app.core.pagination import PageParams
+from app.models.comment import Comment as CommentModel
+from app.models.task import Task as TaskModel
+from app.models.task import TaskAssignment as TaskAssignmentModel
+from app.models.task import TaskPriority, TaskStatus
+from app.schemas.comment import Comment
+from app.schemas.task import Task, TaskAssignment
+from app.schemas.user import User
+from app.tests.test_indexes import task_filters
+
+
+def legacy_body(schema, objects) -> bytes:
+    """What ``response_model`` validation and ``JSONResponse`` produced."""
+    adapter = TypeAdapter(List[schema])
+    content = adapter.dump_python(adapter.validate_python(objects), mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def add_tasks(db, creator_id: int, count: int):
+    now = datetime.now(timezone.utc)
+    db.execute(
+        insert(TaskModel),
+        [
+            {
+                "title": f'Task {i} "quoted"\t\\',
+                "description": None if i % 3 else f"Description {i}\n" * 5,
+                "status": TaskStatus.COMPLETED if i % 2 else TaskStatus.PENDING,
+                "priority": list(TaskPriority)[i % len(TaskPriority)],
+                "creator_id": creator_id,
+                "created_at": now + timedelta(seconds=i, microseconds=i % 7),
+                "completed_at": now + timedelta(hours=1) if i % 2 else None,
+            }
+            for i in range(count)
+        ],
+    )
+    db.commit()
+
+
+class TestParity:
+    """Test the fast path renders exactly what the schemas would."""
+
+    def test_task_list(self, client, db, test_user, auth_headers):
+        """Test task pages match schema output byte for byte."""
+        add_tasks(db, test_user.id, 25)
+        tasks = db.query(TaskModel).order_by(TaskModel.created_at, TaskModel.id)
+
+        response = client.get("/tasks/?limit=100", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == legacy_body(Task, tasks.all())
+
+    def test_sort_key_outside_schema(self, client, db, test_user, auth_headers):
+        """Test the extra sort and version columns stay out of the payload."""
+        add_tasks(db, test_user.id, 5)
+        tasks = db.query(TaskModel).order_by(TaskModel.modified_at, TaskModel.id)
+
+        response = client.get("/tasks/?sort=updated_at&limit=3", headers=auth_headers)
+
+        assert response.content == legacy_body(Task, tasks.limit(3).all())
+        assert "X-Next-Cursor" in response.headers
+        assert set(response.json()[0]) == set(Task.model_fields)
+
+    def test_comments(self, client, db, test_user, test_task, auth_headers):
+        """Test comment pages, cached or not, match schema output."""
+        db.add_all(
+            CommentModel(
+                content=f"Comment {i} <\\>",
+                task_id=test_task.id,
+                author_id=test_user.id,
+            )
+            for i in range(5)
+        )
+        db.commit()
+        comments = db.query(CommentModel).order_by(
+            CommentModel.created_at, CommentModel.id
+        )
+        url = f"/comments/task/{test_task.id}"
+
+        first = client.get(url, headers=auth_headers)
+        page = client.get(f"{url}?limit=2", headers=auth_headers)
+
+        assert first.content == legacy_body(Comment, comments.all())
+        assert page.content == legacy_body(Comment, comments.limit(2).all())
+
+    def test_assignments(
+        self, client, db, test_user, test_user2, test_task, auth_headers
+    ):
+        """Test assignment lists match schema output."""
+        db.add(
+            TaskAssignmentModel(
+                task_id=test_task.id,
+                assigned_user_id=test_user2.id,
+                assigned_by_id=test_user.id,
+            )
+        )
+        db.commit()
+        assignments = db.query(TaskAssignmentModel).all()
+
+        response = client.get(
+            f"/tasks/{test_task.id}/assignments", headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.content == legacy_body(TaskAssignment, assignments)
+
+    def test_users(self, client, db, test_user, admin_user, admin_headers):
+        """Test user pages match schema output and never leak other columns."""
+        users = db.query(type(test_user)).order_by("created_at", "id").all()
+
+        response = client.get("/users/", headers=admin_headers)
+
+        assert response.content == legacy_body(User, users)
+        assert "hashed_password" not in response.json()[0]
+
+
+class TestBenchmark:
+    """Benchmark the fast path against per-object validation."""
+
+    PAGE = 2000
+    ROUNDS = 5
+
+    def best_of(self, fn) -> float:
+        timings = []
+        for _ in range(self.ROUNDS):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def loaders(self, db, user_id: int):
+        """The legacy and fast ways of rendering one large task page."""
+        add_tasks(db, user_id, self.PAGE)
+        page = PageParams(limit=self.PAGE, cursor=None)
+        filters = task_filters()
+
+        def legacy():
+            tasks, _ = crud_task.list_tasks(db, user_id, page, filters)
+            return legacy_body(Task, tasks)
+
+        def fast():
+            rows, _ = crud_task.list_task_rows(db, TASK_ROWS, user_id, page, filters)
+            return TASK_ROWS.encode(rows)
+
+        return legacy, fast
+
+    def test_task_page(self, db, test_user):
+        """Test a large page renders identically on both paths."""
+        legacy, fast = self.loaders(db, test_user.id)
+        assert fast() == legacy()
+
+    @pytest.mark.benchmark
+    def test_task_page_speed(self, db, test_user):
+        """Test a large page is faster to load and encode."""
+        legacy, fast = self.loaders(db, test_user.id)
+        assert self.best_of(fast) < self.best_of(legacy)
+
+
+def selects(statements, table: str):
+    return [s for s in statements if s.startswith("SELECT") and f"FROM {table}" in s]
+
+
+class TestSparseFields:
+    """Test ``?fields=`` trims responses and the columns selected."""
+
+    def test_task_list_projection(
+        self, client, db, test_user, auth_headers, statements
+    ):
+        """Test only the requested task columns are read and returned."""
+        add_tasks(db, test_user.id, 3)
+        statements.clear()
+
+        response = client.get(
+            "/tasks/?fields=id,title,status,priority", headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert [set(task) for task in response.json()] == [
+            {"id", "title", "status", "priority"}
+        ] * 3
+        (query,) = selects(statements, "tasks")
+        assert "tasks.description" not in query
+
+    def test_pagination_without_key_fields(self, client, db, test_user, auth_headers):
+        """Test cursors work when neither id nor the sort key is requested."""
+        add_tasks(db, test_user.id, 3)
+
+        first = client.get("/tasks/?fields=title&limit=2", headers=auth_headers)
+        rest = client.get(
+            f"/tasks/?fields=title&cursor={first.headers['X-Next-Cursor']}",
+            headers=auth_headers,
+        )
+
+        titles = [task["title"] for task in first.json() + rest.json()]
+        assert titles == [f'Task {i} "quoted"\t\\' for i in range(3)]
+
+    def test_invalid_fields(self, client, test_task, auth_headers):
+        """Test names outside the schema are rejected."""
+        for fields in ("id,hashed_password", "xmin", ",", "description_tsv"):
+            response = client.get(f"/tasks/?fields={fields}", headers=auth_headers)
+            assert response.status_code == 400, fields
+
+    def test_task_read(self, client, test_task, auth_headers, statements):
+        """Test a single task is projected and tagged per field set."""
+        full = client.get(f"/tasks/{test_task.id}", headers=auth_headers)
+        statements.clear()
+
+        response = client.get(
+            f"/tasks/{test_task.id}?fields=title,status", headers=auth_headers
+        )
+        again = client.get(
+            f"/tasks/{test_task.id}?fields=status,title",
+            headers={**auth_headers, "If-None-Match": response.headers["ETag"]},
+        )
+
+        assert response.json() == {"title": "Test Task", "status": "pending"}
+        assert "tasks.description" not in selects(statements, "tasks")[0]
+        assert response.headers["ETag"] != full.headers["ETag"]
+        assert again.status_code == 304
+
+    def test_task_fields_with_include(self, client, test_task, auth_headers):
+        """Test fields and include cannot be combined."""
+        response = client.get(
+            f"/tasks/{test_task.id}?fields=title&include=creator",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    def test_comment_projection(
+        self, client, test_task, test_comment, auth_headers, statements
+    ):
+        """Test comment content is only read when asked for."""
+        url = f"/comments/task/{test_task.id}"
+
+        sparse = client.get(f"{url}?fields=id,author_id", headers=auth_headers)
+        full = client.get(url, headers=auth_headers)
+
+        assert sparse.json() == [
+            {"id": test_comment.id, "author_id": test_comment.author_id}
+        ]
+        assert "comments.content" not in selects(statements, "comments")[0]
+        assert full.json()[0]["content"] == "Test comment"
+
+    def test_users(self, client, test_user, admin_headers, auth_headers):
+        """Test user list and profile reads honour fields."""
+        users = client.get("/users/?fields=username", headers=admin_headers)
+        me = client.get("/users/me?fields=id,email", headers=auth_headers)
+
+        assert {"username": "testuser"} in users.json()
+        assert me.json() == {"id": test_user.id, "email": "test@example.com"}
@@ -0,0 +1,171 @@
+"""Tests that the hot filter and join paths are index backed."""
+
+import pytest
+from sqlalchemy import text
+
+ASSIGNMENT_INDEXES = (
+    "ix_task_assignments_task_id_assigned_user_id",
+    "ix_task_assignments_assigned_user_id_task_id",
+)
+
+# query -> indexes the planner may pick for it
+HOT_QUERIES = {
+    "SELECT * FROM tasks WHERE creator_id = 1 AND status = 'PENDING'": (
+        "ix_tasks_creator_id_status",
+    ),
+    "SELECT * FROM tasks WHERE status = 'PENDING'": ("ix_tasks_status",),
+    "SELECT * FROM task_assignments WHERE task_id = 1": (
+        "ix_task_assignments_task_id_assigned_user_id",
+    ),
+    # Both composites cover an equality probe on the pair
+    "SELECT * FROM task_assignments WHERE task_id = 1 AND assigned_user_id = 2": (
+        ASSIGNMENT_INDEXES
+    ),
+    "SELECT tasks.* FROM tasks JOIN task_assignments "
+    "ON tasks.id = task_assignments.task_id "
+    "WHERE task_assignments.assigned_user_id = 2": (
+        "ix_task_assignments_assigned_user_id_task_id",
+    ),
+    "SELECT * FROM comments WHERE task_id = 1 ORDER BY created_at": (
+        "ix_comments_task_id_created_at",
+    ),
+    "SELECT id FROM tasks "
+    "WHERE search_vector @@ websearch_to_tsquery('english', 'report')": (
+        "ix_tasks_search_vector",
+    ),
+    "SELECT task_id FROM comments "
+    "WHERE search_vector @@ websearch_to_tsquery('english', 'report')": (
+        "ix_comments_search_vector",
+    ),
+    "SELECT tasks.* FROM tasks JOIN task_inbox ON tasks.id = task_inbox.task_id "
+    "WHERE task_inbox.user_id = 2 "
+    "ORDER BY task_inbox.last_activity_at DESC, task_inbox.task_id DESC LIMIT 20": (
+        "ix_task_inbox_user_id_activity",
+    ),
+}
+
+
+SEED = [
+    "INSERT INTO users (email, username, hashed_password, is_active, is_admin) "
+    "SELECT 'u' || i || '@example.com', 'u' || i, 'x', true, false "
+    "FROM generate_series(1, 100) i",
+    "INSERT INTO tasks (title, description, status, priority, creator_id, "
+    "completed_at) "
+    "SELECT 'Task ' || i, 'Description ' || i, "
+    "(ARRAY['PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED'])[i % 4 + 1]"
+    "::taskstatus, "
+    "(ARRAY['LOW', 'MEDIUM', 'HIGH', 'URGENT'])[i % 4 + 1]::taskpriority, "
+    "i % 100 + 1, CASE WHEN i % 4 = 2 THEN now() END "
+    "FROM generate_series(1, 5000) i",
+    "INSERT INTO task_assignments (task_id, assigned_user_id, assigned_by_id) "
+    "SELECT id, (id * 7) % 100 + 1, creator_id FROM tasks",
+    "INSERT INTO comments (content, task_id, author_id) "
+    "SELECT 'Comment ' || id, id, creator_id FROM tasks",
+    "ANALYZE",
+]
+
+
+@pytest.fixture
+def planner_stats(db):
+    """Give the planner realistic statistics instead of empty tables."""
+    for statement in SEED:
+        db.execute(text(statement))
+    db.commit()
+
+
+class TestIndexes:
+    """Test query plans for the list, assignment and comment lookups."""
+
+    @pytest.mark.parametrize("query", list(HOT_QUERIES))
+    def test_query_uses_index(self, db, planner_stats, query):
+        """Test the planner picks an expected index for each hot query."""
+        # Small tables still make a sequential scan cheapest; rule it out
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(db.execute(text(f"EXPLAIN {query}")).scalars())
+        db.rollback()
+        assert any(index in plan for index in HOT_QUERIES[query]), plan
+
+
+def task_filters(**given):
+    """TaskFilters with only ``given`` set (bypassing the Query defaults)."""
+    from inspect import signature
+
+    from app.core.task_filters import TaskFilters
+
+    names = signature(TaskFilters).parameters
+    return TaskFilters(**{name: given.get(name) for name in names})
+
+
+# filter -> indexes the planner may pick for the list query using it
+FILTER_INDEXES = {
+    "priority": ({"priority": "HIGH"}, ("ix_tasks_priority_id",)),
+    "creator_id": ({"creator_id": 1}, ("ix_tasks_creator_id_status",)),
+    "assignee_id": (
+        {"assignee_id": 1},
+        ("ix_task_assignments_assigned_user_id_task_id",),
+    ),
+    "created_after": (
+        {"created_after": "2026-01-01"},
+        ("ix_tasks_created_at_id",),
+    ),
+    "completed_before": (
+        {"completed_before": "2026-01-01"},
+        ("ix_tasks_completed_at",),
+    ),
+}
+
+# sort -> index serving ORDER BY (key, id) LIMIT n
+SORT_INDEXES = {
+    "created_at": "ix_tasks_created_at_id",
+    "updated_at": "ix_tasks_modified_at_id",
+    "priority": "ix_tasks_priority_id",
+}
+
+
+class TestTaskListIndexes:
+    """Test that task list filters and sorts are index backed."""
+
+    def test_filter_columns_lead_an_index(self):
+        """Test every column filter has an index led by its column."""
+        from app.core.task_filters import COLUMN_FILTERS
+        from app.models.task import Task
+
+        leading = {
+            next(iter(index.expressions)).name
+            for index in Task.__table__.indexes
+            if hasattr(next(iter(index.expressions)), "name")
+        }
+        assert {column.name for _, column, _ in COLUMN_FILTERS} <= leading
+
+    @pytest.mark.parametrize("name", list(FILTER_INDEXES))
+    def test_filter_uses_index(self, db, planner_stats, name):
+        """Test the planner answers each filter from its index."""
+        from app.models.task import Task
+
+        given, indexes = FILTER_INDEXES[name]
+        query = db.query(Task).filter(*task_filters(**given).clauses(1))
+        sql = query.statement.compile(
+            db.get_bind(), compile_kwargs={"literal_binds": True}
+        )
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(db.execute(text(f"EXPLAIN {sql}")).scalars())
+        db.rollback()
+        assert any(index in plan for index in indexes), plan
+
+    @pytest.mark.parametrize("sort", list(SORT_INDEXES))
+    def test_sort_uses_index(self, db, planner_stats, sort):
+        """Test each indexed sort is read in index order."""
+        from app.core.task_filters import SORT_KEYS
+        from app.models.task import Task
+        from app.schemas.task import TaskSort
+
+        key = SORT_KEYS[TaskSort(sort)]
+        query = db.query(Task).order_by(key, Task.id).limit(50)
+        sql = query.statement.compile(
+            db.get_bind(), compile_kwargs={"literal_binds": True}
+        )
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(db.execute(text(f"EXPLAIN {sql}")).scalars())
+        db.rollback()
+        assert SORT_INDEXES[sort] in plan
+        assert "Sort" not in plan.split("\n")[1], plan
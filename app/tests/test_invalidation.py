@@ -0,0 +1,114 @@
+"""Tests for cross-worker cache invalidation over LISTEN/NOTIFY."""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.invalidation import InvalidationBus
+from app.core.principal_cache import PrincipalCache
+from app.core.read_cache import LocalCache, ReadThroughCache
+from app.tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "Timed out waiting"
+        time.sleep(0.01)
+
+
+class Worker:
+    """The caches and bus one worker process would hold."""
+
+    def __init__(self, channel, listen=True):
+        self.bus = InvalidationBus(SQLALCHEMY_DATABASE_URL, channel, 1)
+        self.read_cache = ReadThroughCache(LocalCache(10), ttl_seconds=60)
+        self.principals = PrincipalCache(maxsize=10, ttl_seconds=60)
+        self.read_cache.attach(self.bus)
+        self.principals.attach(self.bus)
+        self.bus.start(listen=listen)
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    """Two workers sharing a fresh channel, connected and listening."""
+    monkeypatch.setattr(settings, "cache_listener_retry_seconds", 0.05)
+    channel = f"test_{uuid.uuid4().hex[:8]}"
+    pair = [Worker(channel), Worker(channel)]
+    wait_for(lambda: all(w.bus.connected for w in pair))
+    yield pair
+    for worker in pair:
+        worker.bus.stop()
+
+
+class TestInvalidationBus:
+    """Test invalidations reach other workers' caches."""
+
+    def test_read_cache_invalidated_elsewhere(self, workers):
+        """Test an invalidation on one worker evicts the key on the other."""
+        a, b = workers
+        b.read_cache.backend.set("task:1", b"cached", 60)
+        b.read_cache.backend.set("task:2", b"cached", 60)
+        asyncio.run(a.read_cache.invalidate("task:1"))
+        wait_for(lambda: b.read_cache.backend.get("task:1") is None)
+        assert b.read_cache.backend.get("task:2") == b"cached"
+        assert a.bus.received == 0
+
+    def test_principal_invalidated_elsewhere(self, workers, db, test_user):
+        """Test logging a user out on one worker drops them on the other."""
+        a, b = workers
+        b.principals.put("token", test_user, None)
+        a.principals.invalidate_user(test_user.id)
+        wait_for(lambda: b.principals.stats()["size"] == 0)
+
+    def test_listener_reconnects(self, workers, db):
+        """Test a dropped listener clears its caches and reconnects."""
+        a, b = workers
+        b.read_cache.backend.set("task:1", b"cached", 60)
+        db.execute(
+            text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE query LIKE :listen"
+            ),
+            {"listen": f'LISTEN "{b.bus.channel}"'},
+        )
+        db.commit()
+        wait_for(lambda: b.bus.reconnects == 1 and b.bus.connected)
+        assert b.read_cache.backend.get("task:1") is None
+
+        b.read_cache.backend.set("task:3", b"cached", 60)
+        asyncio.run(a.read_cache.invalidate("task:3"))
+        wait_for(lambda: b.read_cache.backend.get("task:3") is None)
+
+    def test_publisher_only(self, workers):
+        """Test a bus that does not listen still publishes, up to its stop."""
+        _, b = workers
+        publisher = Worker(b.bus.channel, listen=False)
+        b.read_cache.backend.set("task:1", b"cached", 60)
+        asyncio.run(publisher.read_cache.invalidate("task:1"))
+        assert not publisher.bus.degraded
+        publisher.bus.stop()
+        wait_for(lambda: b.read_cache.backend.get("task:1") is None)
+
+    def test_degraded_ttl(self):
+        """Test entries are short-lived while the listener is down."""
+        bus = InvalidationBus("postgresql://nobody@127.0.0.1:1/none", "c", 1)
+        assert bus.ttl(60) == 60
+        bus.start()
+        try:
+            assert bus.degraded
+            assert bus.ttl(60) == 1
+        finally:
+            bus.stop()
+
+    def test_large_invalidation_split(self):
+        """Test invalidations are split to fit NOTIFY's payload limit."""
+        bus = InvalidationBus(SQLALCHEMY_DATABASE_URL, "c", 1)
+        keys = [f"task:{i}:comments" for i in range(2000)]
+        payloads = bus._payloads("read", keys)
+        assert len(payloads) > 1
+        assert all(len(p.encode()) < 8000 for p in payloads)
@@ -0,0 +1,217 @@
+"""Tests for the background job queue."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import status
+
+from app import worker
+from app.core import jobs
+from app.models.job import Job, JobStatus
+from app.tests.conftest import TestingSessionLocal
+from app.worker import run_once
+
+
+def run_worker_once() -> int:
+    """Run one worker batch against the test database."""
+    with ThreadPoolExecutor(2) as executor:
+        return run_once(executor, TestingSessionLocal)
+
+
+@pytest.fixture
+def flaky_handler(monkeypatch):
+    """Register a ``flaky`` job kind that always raises."""
+
+    def handler(db, payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "flaky", handler)
+
+
+class TestJobs:
+    """Test job queue and worker."""
+
+    def test_enqueue_and_run(self, db, test_user):
+        """Test that a claimed job runs its handler and is marked done."""
+        user_id = test_user.id
+        job = jobs.enqueue(db, "delete_user", {"user_id": user_id})
+        assert job["status"] == JobStatus.QUEUED
+        assert run_worker_once() == 1
+        db.expire_all()
+        assert db.get(Job, job["id"]).status == JobStatus.DONE
+        assert db.get(Job, job["id"]).attempts == 1
+        assert run_worker_once() == 0
+
+    def test_failed_job_retries_with_backoff(self, db, flaky_handler):
+        """Test that a failing job is requeued later with its error."""
+        job = jobs.enqueue(db, "flaky", {})
+        run_worker_once()
+        db.expire_all()
+        failed = db.get(Job, job["id"])
+        assert failed.status == JobStatus.QUEUED
+        assert failed.last_error == "RuntimeError: boom"
+        assert failed.run_at > job["run_at"]
+        # Not due yet, so the next poll leaves it alone
+        assert run_worker_once() == 0
+
+    def test_failed_job_gives_up(self, db, flaky_handler, monkeypatch):
+        """Test that a job stops retrying after max_attempts."""
+        monkeypatch.setattr(jobs.settings, "job_max_attempts", 2)
+        monkeypatch.setattr(jobs.settings, "job_backoff_base_seconds", 0)
+        job = jobs.enqueue(db, "flaky", {})
+        assert run_worker_once() == 1
+        assert run_worker_once() == 1
+        assert run_worker_once() == 0
+        db.expire_all()
+        assert db.get(Job, job["id"]).status == JobStatus.FAILED
+
+    def test_unknown_kind_fails(self, db, monkeypatch):
+        """Test that a job without a handler is recorded as an error."""
+        monkeypatch.setattr(jobs.settings, "job_max_attempts", 1)
+        job = jobs.enqueue(db, "missing", {})
+        run_worker_once()
+        db.expire_all()
+        assert db.get(Job, job["id"]).status == JobStatus.FAILED
+        assert "No handler" in db.get(Job, job["id"]).last_error
+
+    def test_claims_skip_locked_rows(self, db):
+        """Test that concurrent claims never hand out the same job."""
+        for _ in range(3):
+            jobs.enqueue(db, "noop", {})
+        first, second = TestingSessionLocal(), TestingSessionLocal()
+        try:
+            # Hold the first claim's row locks open while the second claims
+            first.commit = lambda: None
+            claimed_first = jobs.claim_jobs(first, 2)
+            claimed_second = jobs.claim_jobs(second, 10)
+        finally:
+            first.rollback()
+            first.close()
+            second.close()
+        assert len(claimed_first) == 2
+        assert len(claimed_second) == 1
+        assert claimed_second[0]["id"] not in {job["id"] for job in claimed_first}
+
+    def test_expired_claim_is_reclaimed(self, db, monkeypatch):
+        """Test that a job whose worker vanished becomes claimable again."""
+        monkeypatch.setattr(jobs.settings, "job_visibility_timeout_seconds", -1)
+        job = jobs.enqueue(db, "noop", {})
+        assert [j["id"] for j in jobs.claim_jobs(db, 1)] == [job["id"]]
+        reclaimed = jobs.claim_jobs(db, 1)
+        assert reclaimed[0]["attempts"] == 2
+        # The first claim's outcome is fenced off by the attempt count
+        assert not jobs.mark_done(db, {"id": job["id"], "attempts": 1})
+        assert jobs.mark_done(db, reclaimed[0])
+
+    def test_bulk_create_in_background(self, client, auth_headers, db):
+        """Test that POST /tasks/bulk?background=true returns 202 and a job."""
+        from app.models.task import Task
+
+        response = client.post(
+            "/tasks/bulk?background=true",
+            headers=auth_headers,
+            json={"tasks": [{"title": "A"}, {"title": "B"}]},
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job_id = response.json()["id"]
+        assert db.query(Task).count() == 0
+        run_worker_once()
+        assert db.query(Task).count() == 2
+        response = client.get(f"/jobs/{job_id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "done"
+
+    def test_crash_before_settling_leaves_no_writes(self, db, test_user, monkeypatch):
+        """Test a handler's writes are lost with its job's completion."""
+        from app.models.task import Task
+
+        monkeypatch.setattr(jobs.settings, "job_visibility_timeout_seconds", -1)
+        payload = {"creator_id": test_user.id, "tasks": [{"title": "A"}]}
+        jobs.enqueue(db, "create_tasks", payload)
+        (claimed,) = jobs.claim_jobs(db, 1)
+
+        def crash(db, job):
+            raise RuntimeError("worker died")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(worker, "mark_done", crash)
+            with pytest.raises(RuntimeError):
+                worker.run_job(claimed, TestingSessionLocal)
+        assert db.query(Task).count() == 0
+
+        (redelivered,) = jobs.claim_jobs(db, 1)
+        worker.run_job(redelivered, TestingSessionLocal)
+        assert db.query(Task).count() == 1
+
+    def test_reclaimed_job_discards_stale_writes(self, db, test_user, monkeypatch):
+        """Test a worker that overran its claim does not duplicate writes."""
+        from app.models.task import Task
+
+        monkeypatch.setattr(jobs.settings, "job_visibility_timeout_seconds", -1)
+        payload = {"creator_id": test_user.id, "tasks": [{"title": "A"}]}
+        job = jobs.enqueue(db, "create_tasks", payload)
+        (stale,) = jobs.claim_jobs(db, 1)
+        (current,) = jobs.claim_jobs(db, 1)
+
+        worker.run_job(stale, TestingSessionLocal)
+        worker.run_job(current, TestingSessionLocal)
+
+        assert db.query(Task).count() == 1
+        db.expire_all()
+        assert db.get(Job, job["id"]).status == JobStatus.DONE
+
+    def test_worker_publishes_invalidations(
+        self, db, test_user, test_task, monkeypatch
+    ):
+        """Test API workers evict what a job invalidated once it commits."""
+        import threading
+        import uuid
+
+        from app.config import settings
+        from app.core.invalidation import InvalidationBus
+        from app.core.principal_cache import principal_cache
+        from app.core.read_cache import read_cache, task_key
+        from app.tests.conftest import SQLALCHEMY_DATABASE_URL
+        from app.tests.test_invalidation import Worker, wait_for
+
+        api = Worker(f"test_{uuid.uuid4().hex[:8]}")
+        try:
+            wait_for(lambda: api.bus.connected)
+            key = task_key(test_task.id)
+            api.read_cache.backend.set(key, b"cached", 60)
+            jobs.enqueue(db, "delete_user", {"user_id": test_user.id})
+
+            stop = threading.Event()
+
+            def run_once_then_stop(executor):
+                stop.set()
+                return run_once(executor, TestingSessionLocal)
+
+            bus = InvalidationBus(SQLALCHEMY_DATABASE_URL, api.bus.channel, 1)
+            monkeypatch.setattr(worker, "bus", bus)
+            monkeypatch.setattr(worker, "run_once", run_once_then_stop)
+            monkeypatch.setattr(worker.signal, "signal", lambda *args: None)
+            monkeypatch.setattr(settings, "cache_invalidation_enabled", True)
+            monkeypatch.setattr(read_cache, "bus", None)
+            monkeypatch.setattr(principal_cache, "bus", None)
+            worker.main(stop)
+
+            wait_for(lambda: api.read_cache.backend.get(key) is None)
+            assert not bus.running
+        finally:
+            api.bus.stop()
+
+    def test_bulk_background_rejects_invalid_items(self, client, auth_headers):
+        """Test that background bulk creation is always atomic."""
+        response = client.post(
+            "/tasks/bulk?background=true",
+            headers=auth_headers,
+            json={"tasks": [{"title": "A"}, {}], "atomic": False},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_get_job_of_other_user(self, client, auth_headers, db, test_user2):
+        """Test that users cannot see each other's jobs."""
+        job = jobs.enqueue(db, "noop", {}, test_user2.id)
+        response = client.get(f"/jobs/{job['id']}", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
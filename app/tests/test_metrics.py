@@ -0,0 +1,69 @@
+"""Tests for pool telemetry and the metrics endpoint."""
+
+import psycopg2
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import instrumented_pool_class, pool_samples
+from app.tests.conftest import SQLALCHEMY_DATABASE_URL
+
+
+class TestMetrics:
+    """Test pool statistics collection and exposure."""
+
+    def test_pool_records_wait_and_failures(self):
+        """Test checkouts are timed and pool timeouts are counted."""
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            poolclass=instrumented_pool_class("test_pool", QueuePool),
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                with pytest.raises(exc.TimeoutError):
+                    engine.connect()
+                samples = pool_samples()
+                labels = {"pool": "test_pool"}
+                assert (labels, 1) in samples["db_pool_checked_out"]
+                failures = samples["db_pool_checkout_failures_total"]
+                assert ({**labels, "reason": "timeout"}, 1) in failures
+                assert ({**labels, "reason": "connect"}, 0) in failures
+                assert (labels, 2) in samples["db_pool_wait_seconds_count"]
+        finally:
+            engine.dispose()
+
+    def test_pool_counts_connect_failures(self):
+        """Test errors opening a connection count as checkout failures."""
+
+        def creator():
+            raise psycopg2.OperationalError("server closed the connection")
+
+        engine = create_engine(
+            "postgresql://",
+            creator=creator,
+            poolclass=instrumented_pool_class("test_connect_pool", QueuePool),
+        )
+        try:
+            for _ in range(2):
+                with pytest.raises(exc.OperationalError):
+                    engine.connect()
+            failures = pool_samples()["db_pool_checkout_failures_total"]
+            labels = {"pool": "test_connect_pool"}
+            assert ({**labels, "reason": "connect"}, 2) in failures
+            assert ({**labels, "reason": "timeout"}, 0) in failures
+        finally:
+            engine.dispose()
+
+    def test_metrics_endpoint(self, client, auth_headers):
+        """Test the scrape endpoint exposes pool and cache series."""
+        client.get("/auth/me", headers=auth_headers)
+        response = client.get("/metrics")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "db_pool_wait_seconds_count" in response.text
+        assert "principal_cache_misses_total" in response.text
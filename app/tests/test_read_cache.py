@@ -0,0 +1,283 @@
+"""Tests for the read-through response cache."""
+
+import asyncio
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.core.read_cache import (
+    CachedResponse,
+    LocalCache,
+    ReadThroughCache,
+    RedisCache,
+    read_cache,
+)
+from app.tests.test_round_trips import round_trips
+
+
+class RedisStandIn(socketserver.ThreadingTCPServer):
+    """Just enough of a Redis server for GET, SET PX, DEL and FLUSHDB."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RedisHandler)
+        self.data = {}
+
+
+class RedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                size = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(size + 2)[:-2])
+            self.wfile.write(self.reply(args[0].upper(), args[1:]))
+
+    def reply(self, command, args):
+        data = self.server.data
+        if command == b"GET":
+            value, expires_at = data.get(args[0], (None, 0))
+            if value is None or expires_at <= time.monotonic():
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if command == b"SET":
+            data[args[0]] = (args[1], time.monotonic() + int(args[3]) / 1000)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            return b":%d\r\n" % sum(data.pop(k, None) is not None for k in args)
+        if command == b"FLUSHDB":
+            data.clear()
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def redis_url():
+    """URL of a Redis stand-in served from a background thread."""
+    server = RedisStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"redis://127.0.0.1:{server.server_address[1]}/0"
+    server.shutdown()
+    server.server_close()
+
+
+def entry(body: bytes) -> CachedResponse:
+    return CachedResponse(body, '"v"')
+
+
+class TestReadThroughCache:
+    """Test the cache front and its backends."""
+
+    def test_single_flight(self):
+        """Test concurrent misses for a key share one load."""
+        cache = ReadThroughCache(LocalCache(10), ttl_seconds=60)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return entry(b"[]")
+
+        async def main():
+            return await asyncio.gather(
+                *(cache.get_or_load("k", load) for _ in range(5))
+            )
+
+        results = asyncio.run(main())
+        assert [r.body for r in results] == [b"[]"] * 5
+        assert len(loads) == 1
+        assert cache.stats()["coalesced"] == 4
+        asyncio.run(cache.get_or_load("k", load))
+        assert len(loads) == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_invalidated_load_not_stored(self):
+        """Test a load overlapping an invalidation does not repopulate."""
+        cache = ReadThroughCache(LocalCache(10), ttl_seconds=60)
+
+        async def main():
+            async def load():
+                await asyncio.sleep(0.05)
+                return entry(b"old")
+
+            task = asyncio.ensure_future(cache.get_or_load("k", load))
+            await asyncio.sleep(0.01)
+            await cache.invalidate("k")
+            assert (await task).body == b"old"
+            assert cache.backend.get("k") is None
+
+        asyncio.run(main())
+
+    def test_cancelled_leader(self):
+        """Test followers of a cancelled load retry instead of failing."""
+        cache = ReadThroughCache(LocalCache(10), ttl_seconds=60)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return entry(b"[]")
+
+        async def main():
+            leader = asyncio.ensure_future(cache.get_or_load("k", load))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(cache.get_or_load("k", load))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            assert (await follower).body == b"[]"
+            assert leader.cancelled()
+
+        asyncio.run(main())
+        assert len(loads) == 2
+
+    def test_cancelled_follower(self):
+        """Test a cancelled follower stops without a load of its own."""
+        cache = ReadThroughCache(LocalCache(10), ttl_seconds=60)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return entry(b"[]")
+
+        async def main():
+            leader = asyncio.ensure_future(cache.get_or_load("k", load))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(cache.get_or_load("k", load))
+            await asyncio.sleep(0.01)
+            follower.cancel()
+            assert (await leader).body == b"[]"
+            with pytest.raises(asyncio.CancelledError):
+                await follower
+
+        asyncio.run(main())
+        assert len(loads) == 1
+
+    def test_redis_backend(self, redis_url):
+        """Test the Redis backend against a protocol stand-in."""
+        backend = RedisCache(redis_url)
+        assert backend.get("k") is None
+        backend.set("k", b"a\r\nb", ttl_seconds=60)
+        assert backend.get("k") == b"a\r\nb"
+        backend.delete("k")
+        assert backend.get("k") is None
+        backend.set("k", b"x", ttl_seconds=0.01)
+        time.sleep(0.02)
+        assert backend.get("k") is None
+
+    def test_backend_down_falls_back(self, redis_url):
+        """Test backend failures are counted and served from the loader."""
+        cache = ReadThroughCache(RedisCache("redis://127.0.0.1:1/0"), 60)
+
+        async def load():
+            return entry(b"fresh")
+
+        assert asyncio.run(cache.get_or_load("k", load)).body == b"fresh"
+        assert cache.stats()["errors"] == 2
+
+
+class TestCachedEndpoints:
+    """Test cached task and comment reads and their invalidation."""
+
+    @pytest.fixture(params=["local", "redis"])
+    def backend(self, request, monkeypatch):
+        """Run each test against both backends."""
+        if request.param == "redis":
+            server = RedisStandIn()
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            port = server.server_address[1]
+            monkeypatch.setattr(
+                read_cache, "backend", RedisCache(f"redis://127.0.0.1:{port}/0")
+            )
+            yield
+            server.shutdown()
+            server.server_close()
+        else:
+            yield
+
+    def test_task_served_from_cache(
+        self, client, statements, auth_headers, test_task, backend
+    ):
+        """Test a repeat read skips the database until the task changes."""
+        url = f"/tasks/{test_task.id}"
+        first = client.get(url, headers=auth_headers)
+        assert round_trips(client, statements, auth_headers, "GET", url) == 0
+        assert client.get(url, headers=auth_headers).json() == first.json()
+
+        client.put(url, headers=auth_headers, json={"title": "Renamed"})
+        response = client.get(url, headers=auth_headers)
+        assert response.json()["title"] == "Renamed"
+        assert response.headers["ETag"] != first.headers["ETag"]
+
+    def test_comments_invalidated(
+        self, client, auth_headers, test_task, test_comment, backend
+    ):
+        """Test comment writes refresh both the page and the task counter."""
+        url = f"/comments/task/{test_task.id}"
+        task_url = f"/tasks/{test_task.id}"
+        assert len(client.get(url, headers=auth_headers).json()) == 1
+        count = client.get(task_url, headers=auth_headers).json()["comment_count"]
+
+        client.post(url, headers=auth_headers, json={"content": "Second"})
+        assert len(client.get(url, headers=auth_headers).json()) == 2
+        task = client.get(task_url, headers=auth_headers).json()
+        assert task["comment_count"] == count + 1
+
+        client.put(
+            f"/comments/{test_comment.id}",
+            headers=auth_headers,
+            json={"content": "Edited"},
+        )
+        contents = [c["content"] for c in client.get(url, headers=auth_headers).json()]
+        assert contents == ["Edited", "Second"]
+
+        client.delete(f"/tasks/{test_task.id}", headers=auth_headers)
+        assert client.get(url, headers=auth_headers).status_code == 404
+
+    def test_misses_load_from_primary(
+        self, client, db, auth_headers, test_task, test_comment, monkeypatch
+    ):
+        """Test a replica behind the last write never fills the cache."""
+        from sqlalchemy import text
+
+        from app.database import get_read_db
+        from app.main import app
+        from app.tests.conftest import TestingSessionLocal
+
+        # A repeatable read snapshot stands in for a lagging replica
+        replica = TestingSessionLocal()
+        replica.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        replica.execute(text("SELECT 1"))
+
+        def lagging_read_db():
+            yield replica
+
+        monkeypatch.setitem(app.dependency_overrides, get_read_db, lagging_read_db)
+        url = f"/tasks/{test_task.id}"
+        comments_url = f"/comments/task/{test_task.id}"
+        try:
+            client.put(url, headers=auth_headers, json={"title": "Renamed"})
+            client.post(comments_url, headers=auth_headers, json={"content": "New"})
+            task = client.get(url, headers=auth_headers).json()
+            comments = client.get(comments_url, headers=auth_headers).json()
+        finally:
+            replica.close()
+
+        assert task["title"] == "Renamed"
+        assert [c["content"] for c in comments] == ["Test comment", "New"]
+
+    def test_hit_ratio_metric(self, client, auth_headers, test_task):
+        """Test the cache counters are exported."""
+        for _ in range(4):
+            client.get(f"/tasks/{test_task.id}", headers=auth_headers)
+        body = client.get("/metrics").text
+        assert "read_cache_hits_total 3" in body
+        assert "read_cache_hit_ratio 0.75" in body
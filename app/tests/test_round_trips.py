@@ -0,0 +1,156 @@
+"""Round trips issued by write endpoints and expanded reads.
+
+Each test counts the statements a request sends to the database once the
+caller's principal is cached, so a regression that reintroduces a read-back
+after commit, or a per-row lazy load, shows up as a failed assertion.
+"""
+
+from app.models.comment import Comment
+from app.models.task import Task, TaskAssignment
+
+
+def round_trips(client, statements, headers, method, url, **kwargs):
+    """Statements issued by one request after the principal is cached."""
+    client.get("/users/me", headers=headers)
+    statements.clear()
+    response = client.request(method, url, headers=headers, **kwargs)
+    assert response.status_code < 400, response.text
+    return len(statements)
+
+
+class TestWriteRoundTrips:
+    """Test the number of round trips per write."""
+
+    def test_create_task(self, client, statements, auth_headers):
+        """Test that creating a task is a single INSERT ... RETURNING."""
+        count = round_trips(
+            client, statements, auth_headers, "POST", "/tasks/", json={"title": "T"}
+        )
+        assert count == 1
+
+    def test_update_task(self, client, statements, auth_headers, test_task):
+        """Test that updating a task is a single UPDATE ... RETURNING."""
+        count = round_trips(
+            client,
+            statements,
+            auth_headers,
+            "PUT",
+            f"/tasks/{test_task.id}",
+            json={"title": "Renamed"},
+        )
+        assert count == 1
+
+    def test_complete_task(self, client, statements, auth_headers, test_task):
+        """Test that completing a task is the access check plus one UPDATE."""
+        count = round_trips(
+            client, statements, auth_headers, "POST", f"/tasks/{test_task.id}/complete"
+        )
+        assert count == 2
+
+    def test_add_comment(self, client, statements, auth_headers, test_task):
+        """Test that adding a comment is a single INSERT ... RETURNING."""
+        count = round_trips(
+            client,
+            statements,
+            auth_headers,
+            "POST",
+            f"/comments/task/{test_task.id}",
+            json={"content": "Hi"},
+        )
+        assert count == 1
+
+    def test_update_comment(self, client, statements, auth_headers, test_comment):
+        """Test that updating a comment is a single UPDATE ... RETURNING."""
+        count = round_trips(
+            client,
+            statements,
+            auth_headers,
+            "PUT",
+            f"/comments/{test_comment.id}",
+            json={"content": "Edited"},
+        )
+        assert count == 1
+
+    def test_assign_task(self, client, statements, auth_headers, test_task, test_user2):
+        """Test that assigning a user is a single INSERT ... RETURNING."""
+        count = round_trips(
+            client,
+            statements,
+            auth_headers,
+            "POST",
+            f"/tasks/{test_task.id}/assign",
+            json={"assigned_user_id": test_user2.id},
+        )
+        assert count == 1
+
+    def test_update_me(self, client, statements, auth_headers):
+        """Test that updating the profile is a single UPDATE ... RETURNING."""
+        count = round_trips(
+            client,
+            statements,
+            auth_headers,
+            "PUT",
+            "/users/me",
+            json={"username": "renamed"},
+        )
+        assert count == 1
+
+    def test_register(self, client, statements):
+        """Test that registering is two uniqueness probes plus one INSERT."""
+        statements.clear()
+        response = client.post(
+            "/auth/register",
+            json={
+                "email": "new@example.com",
+                "username": "newuser",
+                "password": "password123",
+            },
+        )
+        assert response.status_code == 201, response.text
+        assert len(statements) == 3
+
+
+class TestReadRoundTrips:
+    """Test the number of round trips per read."""
+
+    def test_list_tasks_include_constant(
+        self, client, statements, db, auth_headers, test_user
+    ):
+        """Test that expanding a page costs the same for 1 task as for 100."""
+        url = "/tasks/?limit=100&include=assignments,comments,creator,assignees"
+
+        def add_tasks(count):
+            for _ in range(count):
+                task = Task(title="T", creator_id=test_user.id)
+                db.add(task)
+                db.flush()
+                db.add(Comment(content="C", task_id=task.id, author_id=test_user.id))
+                db.add(
+                    TaskAssignment(
+                        task_id=task.id,
+                        assigned_user_id=test_user.id,
+                        assigned_by_id=test_user.id,
+                    )
+                )
+            db.commit()
+
+        add_tasks(1)
+        one = round_trips(client, statements, auth_headers, "GET", url)
+        add_tasks(99)
+        hundred = round_trips(client, statements, auth_headers, "GET", url)
+        assert one == hundred == 4
+
+    def test_get_task_not_modified(self, client, statements, auth_headers, test_task):
+        """Test that a 304 for a cached task touches no database."""
+        url = f"/tasks/{test_task.id}"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        headers = {**auth_headers, "If-None-Match": etag}
+        assert round_trips(client, statements, headers, "GET", url) == 0
+
+    def test_list_tasks_not_modified(self, client, statements, auth_headers, test_task):
+        """Test that a 304 for a task page only reads row versions."""
+        etag = client.get("/tasks/", headers=auth_headers).headers["ETag"]
+        headers = {**auth_headers, "If-None-Match": etag}
+        assert round_trips(client, statements, headers, "GET", "/tasks/") == 1
+        assert "xmin" in statements[0]
+        assert "description" not in statements[0]
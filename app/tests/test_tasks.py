@@ -1,5 +1,6 @@
 """Tests for task endpoints."""
 
+import pytest
 from fastapi import status
 
 
@@ -93,6 +94,30 @@ class TestTasks:
         response = client.delete(f"/tasks/{test_task.id}", headers=auth_headers)
         assert response.status_code == status.HTTP_204_NO_CONTENT
 
+    def test_delete_task_cascades(
+        self, client, auth_headers, db, test_task, test_comment, test_user2
+    ):
+        """Test that deleting a task removes its comments and assignments."""
+        from app.models.comment import Comment
+        from app.models.task import TaskAssignment
+
+        task_id = test_task.id
+        client.post(
+            f"/tasks/{task_id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        response = client.delete(f"/tasks/{task_id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        db.expire_all()
+        assert db.query(Comment).filter_by(task_id=task_id).count() == 0
+        assert db.query(TaskAssignment).filter_by(task_id=task_id).count() == 0
+
+    def test_delete_task_not_found(self, client, auth_headers):
+        """Test deleting a non-existent task."""
+        response = client.delete("/tasks/999", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
     def test_delete_task_unauthorized(
         self, client, auth_headers, test_task, test_user2
     ):
@@ -196,3 +221,704 @@ class TestTasks:
 
         response = client.post(f"/tasks/{test_task.id}/complete", headers=user2_headers)
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_list_tasks_paginated(self, client, auth_headers):
+        """Test walking the task list with keyset cursors."""
+        for i in range(5):
+            client.post("/tasks/", headers=auth_headers, json={"title": f"Task {i}"})
+
+        titles = []
+        url = "/tasks/?limit=2"
+        while url:
+            response = client.get(url, headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()) <= 2
+            titles.extend(task["title"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            url = f"/tasks/?limit=2&cursor={cursor}" if cursor else None
+        assert titles == [f"Task {i}" for i in range(5)]
+
+    def test_list_tasks_invalid_cursor(self, client, auth_headers):
+        """Test a malformed cursor is rejected."""
+        response = client.get("/tasks/?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_list_tasks_limit_capped(self, client, auth_headers):
+        """Test page sizes above the server maximum are rejected."""
+        response = client.get("/tasks/?limit=100000", headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_export_tasks_ndjson(self, client, auth_headers, test_task, test_user2):
+        """Test streaming tasks with their assignees as NDJSON."""
+        import json
+
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        client.post("/tasks/", headers=auth_headers, json={"title": "Second Task"})
+
+        response = client.get("/tasks/export", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["title"] for row in rows] == ["Test Task", "Second Task"]
+        assert rows[0]["assignee_ids"] == [test_user2.id]
+        assert rows[0]["status"] == "pending"
+        assert rows[1]["assignee_ids"] == []
+
+    def test_export_tasks_csv_filtered(self, client, auth_headers, test_task):
+        """Test CSV export honours the list filters."""
+        client.post(f"/tasks/{test_task.id}/complete", headers=auth_headers)
+        client.post("/tasks/", headers=auth_headers, json={"title": "Open Task"})
+
+        response = client.get(
+            "/tasks/export?format=csv&status=pending", headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        lines = response.text.splitlines()
+        assert lines[0].startswith("id,title,description,status")
+        assert len(lines) == 2
+        assert "Open Task" in lines[1]
+
+    def test_create_tasks_bulk(self, client, auth_headers, test_user):
+        """Test creating a batch of tasks in one request."""
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={
+                "tasks": [
+                    {"title": "Bulk 1"},
+                    {"title": "Bulk 2", "priority": "high"},
+                    {"title": "Bulk 3", "description": "Third"},
+                ]
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert [t["title"] for t in data["created"]] == ["Bulk 1", "Bulk 2", "Bulk 3"]
+        assert data["created"][1]["priority"] == "high"
+        assert all(t["status"] == "pending" for t in data["created"])
+        assert all(t["creator_id"] == test_user.id for t in data["created"])
+        assert all(t["created_at"] for t in data["created"])
+        assert data["errors"] == []
+
+    def test_create_tasks_bulk_atomic_rejects_invalid(self, client, auth_headers):
+        """Test one invalid item rejects an atomic batch."""
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"tasks": [{"title": "Valid"}, {"priority": "high"}]},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["index"] == 1
+        assert client.get("/tasks/", headers=auth_headers).json() == []
+
+    def test_create_tasks_bulk_partial(self, client, auth_headers):
+        """Test a non-atomic batch creates valid items and reports the rest."""
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={
+                "tasks": [{"title": "Valid"}, {"title": "Bad", "priority": "meh"}],
+                "atomic": False,
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert [t["title"] for t in data["created"]] == ["Valid"]
+        assert data["errors"][0]["index"] == 1
+        assert data["errors"][0]["errors"][0]["loc"] == ["priority"]
+
+    def test_create_tasks_bulk_too_large(self, client, auth_headers, monkeypatch):
+        """Test batches above the configured maximum are refused."""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "bulk_create_max_tasks", 2)
+        response = client.post(
+            "/tasks/bulk",
+            headers=auth_headers,
+            json={"tasks": [{"title": f"Task {i}"} for i in range(3)]},
+        )
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    def test_assign_task_unknown_user(self, client, auth_headers, test_task):
+        """Test assigning a user that does not exist."""
+        response = client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": 999},
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json()["detail"] == "User not found"
+
+    def test_assign_task_bulk(
+        self, client, auth_headers, test_task, test_user, test_user2
+    ):
+        """Test bulk assignment reports new, existing and unknown users."""
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        response = client.post(
+            f"/tasks/{test_task.id}/assign/bulk",
+            headers=auth_headers,
+            json={"assigned_user_ids": [test_user.id, test_user2.id, 999]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [a["assigned_user_id"] for a in data["created"]] == [test_user.id]
+        assert data["already_assigned"] == [test_user2.id]
+        assert data["not_found"] == [999]
+
+    def test_assign_task_bulk_nothing_new(
+        self, client, auth_headers, test_task, test_user2, monkeypatch
+    ):
+        """Test a bulk assignment that inserts nothing invalidates nothing."""
+        from app.core.read_cache import read_cache
+
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        invalidated = []
+
+        async def record(*keys):
+            invalidated.extend(keys)
+
+        monkeypatch.setattr(read_cache, "invalidate", record)
+        response = client.post(
+            f"/tasks/{test_task.id}/assign/bulk",
+            headers=auth_headers,
+            json={"assigned_user_ids": [test_user2.id, 999]},
+        )
+        empty = client.post(
+            f"/tasks/{test_task.id}/assign/bulk",
+            headers=auth_headers,
+            json={"assigned_user_ids": []},
+        )
+        assert response.json() == {
+            "created": [],
+            "already_assigned": [test_user2.id],
+            "not_found": [999],
+        }
+        assert empty.json() == {"created": [], "already_assigned": [], "not_found": []}
+        assert invalidated == []
+
+    def test_assign_task_bulk_unauthorized(
+        self, client, test_task, test_user2, auth_headers
+    ):
+        """Test bulk assignment by non-creator."""
+        from app.core.security import create_access_token
+
+        user2_headers = {
+            "Authorization": f"Bearer {create_access_token(data={'sub': test_user2.email})}"  # noqa: E501
+        }
+        response = client.post(
+            f"/tasks/{test_task.id}/assign/bulk",
+            headers=user2_headers,
+            json={"assigned_user_ids": [test_user2.id]},
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_assignee_can_list_assignments_and_complete(
+        self, client, auth_headers, test_task, test_user2
+    ):
+        """Test that an assignee passes the task membership check."""
+        from app.core.security import create_access_token
+
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        user2_headers = {
+            "Authorization": f"Bearer {create_access_token(data={'sub': test_user2.email})}"  # noqa: E501
+        }
+        response = client.get(
+            f"/tasks/{test_task.id}/assignments", headers=user2_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [a["assigned_user_id"] for a in response.json()] == [test_user2.id]
+        response = client.post(f"/tasks/{test_task.id}/complete", headers=user2_headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_assignments_not_found(self, client, auth_headers):
+        """Test listing assignments for a non-existent task."""
+        response = client.get("/tasks/999/assignments", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_task_access_single_query_and_memo(self, db, test_task, test_user2):
+        """Test that the access check is one query and memoized per request."""
+        import asyncio
+        from types import SimpleNamespace
+
+        from sqlalchemy import event
+
+        from app.core.access import get_task_access
+
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        task_id, user_id = test_task.id, test_user2.id
+        request = SimpleNamespace(state=SimpleNamespace())
+        bind = db.get_bind()
+        event.listen(bind, "before_cursor_execute", count)
+        try:
+            first = asyncio.run(get_task_access(request, db, task_id, user_id))
+            again = asyncio.run(get_task_access(request, db, task_id, user_id))
+        finally:
+            event.remove(bind, "before_cursor_execute", count)
+        assert len(statements) == 1
+        assert again is first
+        assert first.task.id == task_id
+        assert not first.is_member
+
+    def test_task_counters(self, client, auth_headers, test_task, test_user2):
+        """Test that comments and assignments update the task counters."""
+        task_id = test_task.id
+        created = client.get(f"/tasks/{task_id}", headers=auth_headers).json()
+        assert created["comment_count"] == 0
+        assert created["assignee_count"] == 0
+        comment = client.post(
+            f"/comments/task/{task_id}", headers=auth_headers, json={"content": "A"}
+        ).json()
+        client.post(
+            f"/comments/task/{task_id}", headers=auth_headers, json={"content": "B"}
+        )
+        client.post(
+            f"/tasks/{task_id}/assign/bulk",
+            headers=auth_headers,
+            json={"assigned_user_ids": [test_user2.id, 999]},
+        )
+        # Already assigned: no change
+        client.post(
+            f"/tasks/{task_id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        client.delete(f"/comments/{comment['id']}", headers=auth_headers)
+        data = client.get(f"/tasks/{task_id}", headers=auth_headers).json()
+        assert data["comment_count"] == 1
+        assert data["assignee_count"] == 1
+        assert data["last_activity_at"] > created["last_activity_at"]
+
+    def test_task_counters_leave_updated_at(
+        self, client, db, auth_headers, test_task, test_user2
+    ):
+        """Test that comments and assignments do not count as task edits."""
+        from app.core import crud_task
+
+        task_id = test_task.id
+        comment = client.post(
+            f"/comments/task/{task_id}", headers=auth_headers, json={"content": "A"}
+        ).json()
+        client.post(
+            f"/tasks/{task_id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        client.delete(f"/comments/{comment['id']}", headers=auth_headers)
+        crud_task.refresh_task_counters(db, [task_id])
+        db.commit()
+
+        data = client.get(f"/tasks/{task_id}", headers=auth_headers).json()
+        assert data["updated_at"] is None
+        assert data["assignee_count"] == 1
+
+    def test_list_tasks_sorted_by_comment_count(self, client, auth_headers):
+        """Test sorting and paging the task list by a counter."""
+        ids = []
+        for comments in (1, 3, 0, 2):
+            task = client.post(
+                "/tasks/", headers=auth_headers, json={"title": "T"}
+            ).json()
+            ids.append(task["id"])
+            for _ in range(comments):
+                client.post(
+                    f"/comments/task/{task['id']}",
+                    headers=auth_headers,
+                    json={"content": "c"},
+                )
+        response = client.get(
+            "/tasks/?sort=comment_count&order=desc&limit=2", headers=auth_headers
+        )
+        first = response.json()
+        response = client.get(
+            f"/tasks/?sort=comment_count&order=desc&limit=2"
+            f"&cursor={response.headers['X-Next-Cursor']}",
+            headers=auth_headers,
+        )
+        second = response.json()
+        assert [t["comment_count"] for t in first + second] == [3, 2, 1, 0]
+        assert [t["id"] for t in first + second] == [ids[1], ids[3], ids[0], ids[2]]
+
+    def test_search_tasks_ranked(self, client, auth_headers):
+        """Test that title matches outrank description matches."""
+        for title, description in (
+            ("Groceries", "Buy milk for the quarterly report party"),
+            ("Quarterly report", "Numbers"),
+            ("Unrelated", "Nothing here"),
+        ):
+            client.post(
+                "/tasks/",
+                headers=auth_headers,
+                json={"title": title, "description": description},
+            )
+        response = client.get("/tasks/search?q=quarterly report", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [t["title"] for t in data] == ["Quarterly report", "Groceries"]
+        assert data[0]["rank"] > data[1]["rank"]
+
+    def test_search_tasks_paginated(self, client, auth_headers):
+        """Test keyset pagination over ranked search results."""
+        for i in range(5):
+            client.post(
+                "/tasks/", headers=auth_headers, json={"title": f"Deploy build {i}"}
+            )
+        seen = []
+        url = "/tasks/search?q=deploy&limit=2"
+        while url:
+            response = client.get(url, headers=auth_headers)
+            seen += [t["id"] for t in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            url = cursor and f"/tasks/search?q=deploy&limit=2&cursor={cursor}"
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    def test_search_tasks_in_comments(self, client, auth_headers, test_task):
+        """Test matching on comment content only when asked to."""
+        client.post(
+            f"/comments/task/{test_task.id}",
+            headers=auth_headers,
+            json={"content": "Blocked on the vendor invoice"},
+        )
+        response = client.get("/tasks/search?q=invoice", headers=auth_headers)
+        assert response.json() == []
+        response = client.get(
+            "/tasks/search?q=invoice&include_comments=true", headers=auth_headers
+        )
+        assert [t["id"] for t in response.json()] == [test_task.id]
+
+    def test_autocomplete_titles(self, client, auth_headers, db):
+        """Test prefix and typo-tolerant title suggestions."""
+        from sqlalchemy import text
+
+        if not db.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first():
+            pytest.skip("pg_trgm is not installed on this server")
+        for title in ("Quarterly report", "Quartz migration", "Unrelated"):
+            client.post("/tasks/", headers=auth_headers, json={"title": title})
+        response = client.get("/tasks/autocomplete?q=Quar", headers=auth_headers)
+        assert {t["title"] for t in response.json()} == {
+            "Quarterly report",
+            "Quartz migration",
+        }
+        response = client.get("/tasks/autocomplete?q=quartely", headers=auth_headers)
+        assert response.json()[0]["title"] == "Quarterly report"
+
+    def test_autocomplete_without_pg_trgm(self, client, auth_headers, monkeypatch):
+        """Test suggestions fall back to exact prefixes without pg_trgm."""
+        from app.core import crud_task
+
+        monkeypatch.setattr(crud_task, "pg_trgm_installed", lambda db: False)
+        for title in ("Quartz migration", "Quarterly report", "Unrelated"):
+            client.post("/tasks/", headers=auth_headers, json={"title": title})
+        response = client.get("/tasks/autocomplete?q=quar", headers=auth_headers)
+        assert response.status_code == 200
+        assert [t["title"] for t in response.json()] == [
+            "Quarterly report",
+            "Quartz migration",
+        ]
+
+    def test_search_invalid_cursor(self, client, auth_headers):
+        """Test a search cursor without a numeric rank is rejected."""
+        from app.core.pagination import encode_cursor
+
+        cursor = encode_cursor("not-a-rank", 1)
+        response = client.get(
+            f"/tasks/search?q=report&cursor={cursor}", headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    def test_list_tasks_filters(self, client, auth_headers, test_user, test_user2):
+        """Test the priority, creator, assignee and date range filters."""
+        from app.core.security import create_access_token
+
+        user2_headers = {
+            "Authorization": f"Bearer {create_access_token(data={'sub': test_user2.email})}"  # noqa: E501
+        }
+        mine = client.post(
+            "/tasks/", headers=auth_headers, json={"title": "A", "priority": "high"}
+        ).json()
+        theirs = client.post(
+            "/tasks/", headers=user2_headers, json={"title": "B", "priority": "low"}
+        ).json()
+        client.post(
+            f"/tasks/{theirs['id']}/assign",
+            headers=user2_headers,
+            json={"assigned_user_id": test_user.id},
+        )
+        client.post(f"/tasks/{mine['id']}/complete", headers=auth_headers)
+
+        def ids(query):
+            response = client.get(f"/tasks/?{query}", headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK, response.text
+            return [t["id"] for t in response.json()]
+
+        assert ids("priority=high") == [mine["id"]]
+        assert ids(f"creator_id={test_user2.id}") == [theirs["id"]]
+        assert ids(f"assignee_id={test_user.id}") == [theirs["id"]]
+        assert ids("completed_after=2000-01-01T00:00:00Z") == [mine["id"]]
+        assert ids("completed_before=2000-01-01T00:00:00Z") == []
+        assert ids("created_before=2000-01-01T00:00:00Z") == []
+        assert ids("created_after=2000-01-01T00:00:00Z&priority=low") == [theirs["id"]]
+
+    def test_list_tasks_sorted_by_priority(self, client, auth_headers):
+        """Test that priority sorts by urgency, not alphabetically."""
+        for priority in ("medium", "urgent", "low", "high"):
+            client.post(
+                "/tasks/",
+                headers=auth_headers,
+                json={"title": priority, "priority": priority},
+            )
+        response = client.get(
+            "/tasks/?sort=priority&order=desc&limit=3", headers=auth_headers
+        )
+        first = [t["priority"] for t in response.json()]
+        response = client.get(
+            f"/tasks/?sort=priority&order=desc&limit=3"
+            f"&cursor={response.headers['X-Next-Cursor']}",
+            headers=auth_headers,
+        )
+        rest = [t["priority"] for t in response.json()]
+        assert first + rest == ["urgent", "high", "medium", "low"]
+
+    def test_list_tasks_sorted_by_updated_at(self, client, auth_headers):
+        """Test that updated_at sorts never-updated tasks by creation."""
+        first = client.post("/tasks/", headers=auth_headers, json={"title": "1"})
+        second = client.post("/tasks/", headers=auth_headers, json={"title": "2"})
+        client.put(
+            f"/tasks/{first.json()['id']}",
+            headers=auth_headers,
+            json={"title": "1 edited"},
+        )
+        response = client.get("/tasks/?sort=updated_at", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == [
+            second.json()["id"],
+            first.json()["id"],
+        ]
+
+    def test_get_task_include(
+        self, client, auth_headers, test_task, test_comment, test_user, test_user2
+    ):
+        """Test that include expands exactly the requested resources."""
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        response = client.get(
+            f"/tasks/{test_task.id}?include=creator,assignees,comments",
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["creator"] == {"id": test_user.id, "username": "testuser"}
+        assert data["assignees"] == [{"id": test_user2.id, "username": "testuser2"}]
+        assert [c["content"] for c in data["comments"]] == ["Test comment"]
+        assert "assignments" not in data
+
+        plain = client.get(f"/tasks/{test_task.id}", headers=auth_headers).json()
+        assert not {"assignments", "comments", "creator", "assignees"} & set(plain)
+
+    def test_list_tasks_include(self, client, auth_headers, test_task, test_user2):
+        """Test that include also expands every task on a list page."""
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        response = client.get("/tasks/?include=assignments", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        [task] = response.json()
+        assert [a["assigned_user_id"] for a in task["assignments"]] == [test_user2.id]
+
+    def test_list_tasks_invalid_include(self, client, auth_headers):
+        """Test that an unknown include name is rejected."""
+        response = client.get("/tasks/?include=creator,owner", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_task_stats(self, client, auth_headers, test_task):
+        """Test that stats follow creates, updates, completions and deletes."""
+        urgent = client.post(
+            "/tasks/", headers=auth_headers, json={"title": "U", "priority": "urgent"}
+        ).json()
+        doomed = client.post("/tasks/", headers=auth_headers, json={"title": "D"})
+        client.put(
+            f"/tasks/{test_task.id}", headers=auth_headers, json={"priority": "low"}
+        )
+        client.post(f"/tasks/{urgent['id']}/complete", headers=auth_headers)
+        client.delete(f"/tasks/{doomed.json()['id']}", headers=auth_headers)
+
+        response = client.get("/tasks/stats", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()
+        assert stats["total"] == 2
+        assert stats["by_status"] == {
+            "pending": 1,
+            "in_progress": 0,
+            "completed": 1,
+            "cancelled": 0,
+        }
+        assert stats["by_priority"] == {
+            "low": 1,
+            "medium": 0,
+            "high": 0,
+            "urgent": 1,
+        }
+        assert stats["completion_rate"] == 0.5
+        assert stats["completion_latency_seconds"] == {
+            "p50": 2.0,
+            "p90": 2.0,
+            "p99": 2.0,
+        }
+
+    def test_task_stats_scope(
+        self, client, auth_headers, admin_headers, test_task, test_user2
+    ):
+        """Test that only admins see stats across all users."""
+        client.post("/tasks/", headers=admin_headers, json={"title": "Admin's"})
+        mine = client.get("/tasks/stats", headers=auth_headers).json()
+        assert mine["total"] == 1
+        assert mine["completion_latency_seconds"] == {
+            "p50": None,
+            "p90": None,
+            "p99": None,
+        }
+        response = client.get("/tasks/stats?scope=all", headers=auth_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        response = client.get("/tasks/stats?scope=all", headers=admin_headers)
+        assert response.json()["total"] == 2
+
+    def test_inbox(self, client, auth_headers, test_user, test_user2):
+        """Test the inbox merges created and assigned tasks by activity."""
+        from app.core.security import create_access_token
+
+        other_headers = {
+            "Authorization": "Bearer "
+            + create_access_token(data={"sub": test_user2.email})
+        }
+        mine = client.post("/tasks/", headers=auth_headers, json={"title": "Mine"})
+        theirs = client.post("/tasks/", headers=other_headers, json={"title": "Ours"})
+        client.post("/tasks/", headers=other_headers, json={"title": "Theirs"})
+        both = client.post("/tasks/", headers=auth_headers, json={"title": "Both"})
+        client.post(
+            f"/tasks/{theirs.json()['id']}/assign",
+            headers=other_headers,
+            json={"assigned_user_id": test_user.id},
+        )
+        client.post(
+            f"/tasks/{both.json()['id']}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user.id},
+        )
+        client.post(
+            f"/comments/task/{mine.json()['id']}",
+            headers=auth_headers,
+            json={"content": "Bump"},
+        )
+
+        response = client.get("/tasks/inbox?limit=2", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        titles = [t["title"] for t in response.json()]
+        response = client.get(
+            f"/tasks/inbox?limit=2&cursor={response.headers['X-Next-Cursor']}",
+            headers=auth_headers,
+        )
+        titles += [t["title"] for t in response.json()]
+        assert "X-Next-Cursor" not in response.headers
+        assert titles == ["Mine", "Both", "Ours"]
+
+    def test_inbox_drops_deleted_tasks(self, client, auth_headers, test_task):
+        """Test a deleted task leaves its creator's inbox."""
+        client.delete(f"/tasks/{test_task.id}", headers=auth_headers)
+        response = client.get("/tasks/inbox", headers=auth_headers)
+        assert response.json() == []
+
+    def test_get_task_etag(self, client, auth_headers, test_task):
+        """Test conditional GETs of a task until it changes."""
+        url = f"/tasks/{test_task.id}"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+        response = client.get(
+            url, headers={**auth_headers, "If-None-Match": f"W/{etag}"}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.put(url, headers=auth_headers, json={"title": "Renamed"})
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+        url += "?include=comments"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        client.post(
+            f"/comments/task/{test_task.id}",
+            headers=auth_headers,
+            json={"content": "C"},
+        )
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_tasks_etag(self, client, auth_headers, test_task):
+        """Test conditional GETs of a task list page."""
+        etag = client.get("/tasks/", headers=auth_headers).headers["ETag"]
+        headers = {**auth_headers, "If-None-Match": etag}
+        response = client.get("/tasks/", headers=headers)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        client.post("/tasks/", headers=auth_headers, json={"title": "New"})
+        response = client.get("/tasks/", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 2
+
+    def test_list_tasks_etag_next_page(self, client, auth_headers, test_task):
+        """Test a full page is modified once a next page appears after it."""
+        url = "/tasks/?limit=1"
+        first = client.get(url, headers=auth_headers)
+        assert "X-Next-Cursor" not in first.headers
+        headers = {**auth_headers, "If-None-Match": first.headers["ETag"]}
+
+        client.post("/tasks/", headers=auth_headers, json={"title": "New"})
+        response = client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Next-Cursor" in response.headers
+
+        headers["If-None-Match"] = response.headers["ETag"]
+        response = client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_list_assignments_etag(self, client, auth_headers, test_task, test_user2):
+        """Test conditional GETs of a task's assignments."""
+        url = f"/tasks/{test_task.id}/assignments"
+        etag = client.get(url, headers=auth_headers).headers["ETag"]
+        headers = {**auth_headers, "If-None-Match": etag}
+        assert client.get(url, headers=headers).status_code == 304
+        client.post(
+            f"/tasks/{test_task.id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        assert client.get(url, headers=headers).status_code == 200
@@ -62,7 +62,75 @@ class TestUsers:
     def test_delete_me(self, client, auth_headers):
         """Test deleting current user account."""
         response = client.delete("/users/me", headers=auth_headers)
-        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["kind"] == "delete_user"
+        assert response.headers["Location"] == f"/jobs/{response.json()['id']}"
+        # Deactivated immediately, before any worker runs
+        response = client.get("/users/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_delete_me_with_owned_tasks(
+        self, client, auth_headers, db, test_task, test_comment, test_user2
+    ):
+        """Test that deleting a user cascades to what they own."""
+        from app.core.security import create_access_token
+        from app.models.comment import Comment
+        from app.models.task import Task, TaskAssignment
+        from app.tests.test_jobs import run_worker_once
+
+        task_id = test_task.id
+        user2_headers = {
+            "Authorization": f"Bearer {create_access_token(data={'sub': test_user2.email})}"  # noqa: E501
+        }
+        other = client.post(
+            "/tasks/", headers=user2_headers, json={"title": "Other"}
+        ).json()
+        client.post(
+            f"/comments/task/{other['id']}",
+            headers=auth_headers,
+            json={"content": "On someone else's task"},
+        )
+        client.post(
+            f"/tasks/{task_id}/assign",
+            headers=auth_headers,
+            json={"assigned_user_id": test_user2.id},
+        )
+        response = client.delete("/users/me", headers=auth_headers)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        run_worker_once()
+        db.expire_all()
+        assert db.get(Task, task_id) is None
+        assert db.get(Task, other["id"]).comment_count == 0
+        assert db.query(Comment).count() == 0
+        assert db.query(TaskAssignment).count() == 0
+
+    def test_delete_me_invalidates_cached_reads(
+        self, client, auth_headers, test_task, test_user2
+    ):
+        """Test the delete job drops cached reads of the tasks it touched."""
+        from app.core.security import create_access_token
+        from app.tests.test_jobs import run_worker_once
+
+        user2_headers = {
+            "Authorization": f"Bearer {create_access_token(data={'sub': test_user2.email})}"  # noqa: E501
+        }
+        other = client.post(
+            "/tasks/", headers=user2_headers, json={"title": "Other"}
+        ).json()
+        comments_url = f"/comments/task/{other['id']}"
+        client.post(comments_url, headers=auth_headers, json={"content": "Mine"})
+        own_url, other_url = f"/tasks/{test_task.id}", f"/tasks/{other['id']}"
+        # Warm the cache for every read the delete makes stale
+        assert client.get(own_url, headers=user2_headers).status_code == 200
+        assert client.get(other_url, headers=user2_headers).json()["comment_count"]
+        assert len(client.get(comments_url, headers=user2_headers).json()) == 1
+
+        client.delete("/users/me", headers=auth_headers)
+        run_worker_once()
+
+        assert client.get(own_url, headers=user2_headers).status_code == 404
+        assert client.get(other_url, headers=user2_headers).json()["comment_count"] == 0
+        assert client.get(comments_url, headers=user2_headers).json() == []
 
     def test_delete_me_unauthorized(self, client):
         """Test deleting user account without authentication."""
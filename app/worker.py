@@ -0,0 +1,135 @@
+"""Background job worker.
+
+Run with ``python -m app.worker``. Each process claims batches of due jobs
+with ``SELECT ... FOR UPDATE SKIP LOCKED`` and runs them on a thread pool of
+``job_worker_concurrency`` threads; start more processes to scale out.
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import crud_task, crud_user
+from app.core.invalidation import bus
+from app.core.jobs import (
+    JOB_HANDLERS,
+    AfterCommit,
+    claim_jobs,
+    job_handler,
+    mark_done,
+    mark_failed,
+)
+from app.core.principal_cache import principal_cache
+from app.core.read_cache import read_cache, task_keys
+from app.database import SessionLocal
+from app.schemas.task import TaskCreate
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], Session]
+
+
+@job_handler("delete_user")
+def delete_user(db: Session, payload: Dict[str, Any]) -> AfterCommit:
+    keys = task_keys(*crud_user.delete_user(db, payload["user_id"]))
+    return lambda: asyncio.run(read_cache.invalidate(*keys))
+
+
+@job_handler("create_tasks")
+def create_tasks(db: Session, payload: Dict[str, Any]) -> None:
+    tasks_in = [TaskCreate.model_validate(item) for item in payload["tasks"]]
+    crud_task.create_tasks(db, tasks_in, payload["creator_id"])
+
+
+def run_job(job: RowMapping, session_factory: SessionFactory = SessionLocal) -> None:
+    """Run one claimed job and record its outcome.
+
+    The handler gets a session joined to this one's transaction, where its
+    commits only release savepoints. Its writes therefore become durable
+    in the same commit as ``mark_done``, fenced on ``attempts``: a crash in
+    between, or a re-claim after the visibility timeout, leaves nothing
+    behind for the next delivery to duplicate. The handler's ``AfterCommit``
+    callback, if any, runs only once that commit succeeded.
+    """
+    with session_factory() as db:
+        if job["attempts"] > job["max_attempts"]:
+            # Claimed again after its worker's visibility timeout lapsed
+            mark_failed(db, job, "Visibility timeout exceeded on every attempt")
+            return
+        handler = JOB_HANDLERS.get(job["kind"])
+        after_commit: Optional[AfterCommit] = None
+        try:
+            if handler is None:
+                raise LookupError(f"No handler for job kind {job['kind']!r}")
+            with Session(
+                bind=db.connection(), join_transaction_mode="create_savepoint"
+            ) as work:
+                after_commit = handler(work, job["payload"])
+        except Exception as e:
+            db.rollback()
+            logger.exception("Job %s (%s) failed", job["id"], job["kind"])
+            mark_failed(db, job, f"{type(e).__name__}: {e}")
+        else:
+            if not mark_done(db, job):
+                logger.warning(
+                    "Job %s was re-claimed while running; discarded its writes",
+                    job["id"],
+                )
+            elif after_commit is not None:
+                try:
+                    after_commit()
+                except Exception:
+                    logger.exception("Job %s after-commit step failed", job["id"])
+
+
+def run_once(
+    executor: ThreadPoolExecutor, session_factory: SessionFactory = SessionLocal
+) -> int:
+    """Claim one batch, run it to completion and return its size."""
+    with session_factory() as db:
+        jobs = claim_jobs(db, settings.job_claim_batch_size)
+    list(executor.map(lambda job: run_job(job, session_factory), jobs))
+    return len(jobs)
+
+
+def main(stop: Optional[threading.Event] = None) -> None:
+    """Poll for jobs until SIGINT/SIGTERM, finishing the batch in flight."""
+    stop = stop or threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    if settings.cache_invalidation_enabled:
+        # Jobs write, so API workers must hear about what they invalidate;
+        # nothing here reads the caches, so there is no need to listen
+        principal_cache.attach(bus)
+        read_cache.attach(bus)
+        bus.start(listen=False)
+    logger.info(
+        "Worker started: concurrency=%s batch=%s",
+        settings.job_worker_concurrency,
+        settings.job_claim_batch_size,
+    )
+    try:
+        with ThreadPoolExecutor(settings.job_worker_concurrency) as executor:
+            while not stop.is_set():
+                try:
+                    claimed = run_once(executor)
+                except Exception:
+                    logger.exception("Claiming jobs failed")
+                    claimed = 0
+                if not claimed:
+                    stop.wait(settings.job_poll_interval_seconds)
+    finally:
+        bus.stop()
+    logger.info("Worker stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()